@@ -107,6 +107,12 @@ import statsmodels.api as sm
 from scipy.stats import norm
 from scipy.stats import t
 import plotly.express as px
+import os
+import sys
+
+# Shared pipeline lives at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from delhivery import LOCATION_COLUMNS, aggregate_trips, bucketize, build_route_records, corridor_cube, distinct_counts, load_segments, slice_corridors, split_center_codes, split_place_names, trip_locations
 
 
 # ================================================================================
@@ -127,7 +133,8 @@ pd.set_option('display.max_columns', None)
 # CODE CELL 5
 # ================================================================================
 
-df = pd.read_csv("delhivery_data.txt")
+# Only the columns the notebook uses, with schema dtypes
+df = load_segments("notebook")
 
 
 # ================================================================================
@@ -190,9 +197,9 @@ df.isna().sum()
 # CODE CELL 14
 # ================================================================================
 
-df["od_end_time"] = pd.to_datetime(df["od_end_time"])
-df["od_start_time"] = pd.to_datetime(df["od_start_time"])
-df["trip_creation_time"] = pd.to_datetime(df["trip_creation_time"])
+# od_end_time, od_start_time and trip_creation_time arrive as datetimes:
+# load_segments decodes them with the fixed YYYY-MM-DD HH:MM:SS.ffffff layout
+df[["od_end_time", "od_start_time", "trip_creation_time"]].dtypes
 
 
 # ================================================================================
@@ -283,21 +290,21 @@ df.nunique()
 # CODE CELL 26
 # ================================================================================
 
-df.groupby("trip_uuid")["route_type"].unique().reset_index()["route_type"].apply(lambda x:x[0]).value_counts()
+df.groupby("trip_uuid", observed=True)["route_type"].first().value_counts()
 
 
 # ================================================================================
 # CODE CELL 27
 # ================================================================================
 
-df.groupby("trip_uuid")["route_type"].unique().reset_index()["route_type"].apply(lambda x:x[0]).value_counts(normalize = True)*100
+df.groupby("trip_uuid", observed=True)["route_type"].first().value_counts(normalize = True)*100
 
 
 # ================================================================================
 # CODE CELL 28
 # ================================================================================
 
-routeType_plot= (df.groupby("trip_uuid")["route_type"].unique().reset_index()["route_type"].apply(lambda x:x[0]).value_counts(normalize = True)*100)
+routeType_plot= (df.groupby("trip_uuid", observed=True)["route_type"].first().value_counts(normalize = True)*100)
 routeType_plot
 
 
@@ -400,19 +407,23 @@ df[df["trip_uuid"]=="trip-153741093647649320"]
 # CODE CELL 38
 # ================================================================================
 
-df["source_city"] = df["source_name"].str.split(" ",n=1,expand=True)[0].str.split("_",n=1,expand=True)[0]
-df["source_state"] = df["source_name"].str.split(" ",n=1,expand=True)[1].str.replace("(","").str.replace(")","")
+# Each distinct facility name is parsed once and broadcast back to its segments
+source_places = split_place_names(df["source_name"])
+destination_places = split_place_names(df["destination_name"])
+
+df["source_city"] = source_places["city"]
+df["source_state"] = source_places["state"]
 
-df["destination_city"] = df["destination_name"].str.split(" ",n=1,expand=True)[0].str.split("_",n=1,expand=True)[0]
-df["destination_state"] = df["destination_name"].str.split(" ",n=1,expand=True)[1].str.replace("(","").str.replace(")","")
+df["destination_city"] = destination_places["city"]
+df["destination_state"] = destination_places["state"]
 
 
 # ================================================================================
 # CODE CELL 39
 # ================================================================================
 
-df["source_place"] = df["source_name"].str.split("_",n=2,expand=True)[1]
-df["destination_place"] = df["destination_name"].str.split("_",n=2,expand=True)[1]
+df["source_place"] = source_places["place"]
+df["destination_place"] = destination_places["place"]
 
 
 
@@ -427,8 +438,9 @@ df["destination_place"] = df["destination_name"].str.split("_",n=2,expand=True)[
 # CODE CELL 41
 # ================================================================================
 
-df["source_pincode"] = df["source_center"].apply(lambda x : x[3:9] )
-df["destination_pincode"] = df["destination_center"].apply(lambda x : x[3:9] )
+# Pincode = characters 3-9 of the center ID, sliced once per distinct center and stored as Int32
+df["source_pincode"] = split_center_codes(df["source_center"], ["pincode"])["pincode"]
+df["destination_pincode"] = split_center_codes(df["destination_center"], ["pincode"])["pincode"]
 
 
 # ================================================================================
@@ -519,102 +531,8 @@ df.shape
 # CODE CELL 53
 # ================================================================================
 
-df["source_state"] = df["source_state"].replace({"Goa Goa":"Goa",
-                           "Layout PC Karnataka":"Karnataka",
-                           "Vadgaon Sheri DPC Maharashtra":"Maharashtra",
-                           "Pashan DPC Maharashtra":"Maharashtra",
-                           "City Madhya Pradesh":"Madhya Pradesh",
-                           "02_DPC Uttar Pradesh":"Uttar Pradesh",
-                           "Nagar_DC Rajasthan":"Rajasthan",
-                           "Alipore_DPC West Bengal":"West Bengal",
-                            "Mandakni Madhya Pradesh":"Madhya Pradesh",
-                            "West _Dc Maharashtra":"Maharashtra",
-                            "DC Rajasthan":"Rajasthan",
-                            "MP Nagar Madhya Pradesh":"Madhya Pradesh",
-                            "Antop Hill Maharashtra":"Maharashtra",
-                            "Avenue_DPC West Bengal":"West Bengal",
-                            "Nagar Uttar Pradesh":"Uttar Pradesh",
-                            "Balaji Nagar Maharashtra":"Maharashtra",
-                            "Kothanur_L Karnataka":"Karnataka",
-                            "Rahatani DPC Maharashtra":"Maharashtra",
-                            "Mahim Maharashtra":"Maharashtra",
-                            "DC Maharashtra":"Maharashtra",
-                            "_NAD Andhra Pradesh":"Andhra Pradesh",
-                                                       })
-
-
-# ================================================================================
-# CODE CELL 54
-# ================================================================================
-
-df["destination_state"] = df["destination_state"].replace({"Goa Goa":"Goa",
-                           "Layout PC Karnataka":"Karnataka",
-                           "Vadgaon Sheri DPC Maharashtra":"Maharashtra",
-                           "Pashan DPC Maharashtra":"Maharashtra",
-                           "City Madhya Pradesh":"Madhya Pradesh",
-                           "02_DPC Uttar Pradesh":"Uttar Pradesh",
-                           "Nagar_DC Rajasthan":"Rajasthan",
-                           "Alipore_DPC West Bengal":"West Bengal",
-                            "Mandakni Madhya Pradesh":"Madhya Pradesh",
-                            "West _Dc Maharashtra":"Maharashtra",
-                            "DC Rajasthan":"Rajasthan",
-                            "MP Nagar Madhya Pradesh":"Madhya Pradesh",
-                            "Antop Hill Maharashtra":"Maharashtra",
-                            "Avenue_DPC West Bengal":"West Bengal",
-                            "Nagar Uttar Pradesh":"Uttar Pradesh",
-                            "Balaji Nagar Maharashtra":"Maharashtra",
-                            "Kothanur_L Karnataka":"Karnataka",
-                            "Rahatani DPC Maharashtra":"Maharashtra",
-                            "Mahim Maharashtra":"Maharashtra",
-                            "DC Maharashtra":"Maharashtra",
-                            "_NAD Andhra Pradesh":"Andhra Pradesh",
-                           "Delhi Delhi":"Delhi",
-                           "West_Dc Maharashtra":"Maharashtra",
-                           "Hub Maharashtra":"Maharashtra"
-                                                       })
-
-
-# ================================================================================
-# CODE CELL 55
-# ================================================================================
-
-df["destination_city"].replace({
-    "del":"Delhi"
-},inplace=True)
-df["source_city"].replace({
-    "del":"Delhi"
-},inplace=True)
-
-
-# ================================================================================
-# MARKDOWN CELL 56
-# ================================================================================
-# 
-# 
-
-
-# ================================================================================
-# CODE CELL 57
-# ================================================================================
-
-df["source_city"].replace({
-    "Bangalore":"Bengaluru"
-        },inplace=True)
-df["destination_city"].replace({
-    "Bangalore":"Bengaluru"
-        },inplace=True)
-df["destination_city"].replace({
-    "AMD":"Ahmedabad"
-        },inplace=True)
-df["destination_city"].replace({
-    "Amdavad":"Ahmedabad"
-        },inplace=True)
-df["source_city"].replace({
-    "AMD":"Ahmedabad"
-        },inplace=True)
-df["source_city"].replace({
-    "Amdavad":"Ahmedabad"
-        },inplace=True)
+# City and state aliases ("Goa Goa", "DC Maharashtra", "del", "Bangalore", "AMD", ...)
+# are already normalized by split_place_names, from delhivery/data/place_aliases.json
 
 
 # ================================================================================
@@ -699,7 +617,7 @@ data.columns
 # CODE CELL 69
 # ================================================================================
 
-data.drop(['source_center',"source_name","destination_center","destination_name","cutoff_timestamp"],axis = 1,inplace=True)
+data.drop(['source_center',"source_name","destination_center","destination_name"],axis = 1,inplace=True)
 
 
 # ================================================================================
@@ -726,24 +644,18 @@ data
 # CODE CELL 73
 # ================================================================================
 
-actual_time = data.groupby(["trip_uuid",
-              "start_scan_to_end_scan"])["actual_time"].max().reset_index().groupby("trip_uuid")["actual_time"].sum().reset_index()
-segment_osrm_time = data[["trip_uuid","segment_osrm_time"]].groupby("trip_uuid")["segment_osrm_time"].sum().reset_index()
-segment_actual_time = data.groupby("trip_uuid")["segment_actual_time"].sum().reset_index()
-osrm_time = data.groupby(["trip_uuid",
-              "start_scan_to_end_scan"])["osrm_time"].max().reset_index().groupby("trip_uuid")["osrm_time"].sum().reset_index()
-time_taken_btwn_odstart_and_od_end = data.groupby("trip_uuid")["time_taken_btwn_odstart_and_od_end"].unique().reset_index()
-
-time_taken_btwn_odstart_and_od_end["time_taken_btwn_odstart_and_od_end"] = time_taken_btwn_odstart_and_od_end["time_taken_btwn_odstart_and_od_end"].apply(sum)
-start_scan_to_end_scan = ((data.groupby("trip_uuid")["start_scan_to_end_scan"].unique())).reset_index()
-start_scan_to_end_scan["start_scan_to_end_scan"] = start_scan_to_end_scan["start_scan_to_end_scan"].apply(sum) 
-
-osrm_distance = data.groupby(["trip_uuid",
-              "start_scan_to_end_scan"])["osrm_distance"].max().reset_index().groupby("trip_uuid")["osrm_distance"].sum().reset_index()
-actual_distance_to_destination = data.groupby(["trip_uuid",
-              "start_scan_to_end_scan"])["actual_distance_to_destination"].max().reset_index().groupby("trip_uuid")["actual_distance_to_destination"].sum().reset_index()
-segment_osrm_distance = data[["trip_uuid",
-                              "segment_osrm_distance"]].groupby("trip_uuid")["segment_osrm_distance"].sum().reset_index()
+# One pass of the shared aggregation engine; the per-metric frames keep the
+# names the hypothesis tests below use.
+trip_metrics = aggregate_trips(data)
+actual_time = trip_metrics[["trip_uuid","actual_time"]]
+segment_osrm_time = trip_metrics[["trip_uuid","segment_osrm_time"]]
+segment_actual_time = trip_metrics[["trip_uuid","segment_actual_time"]]
+osrm_time = trip_metrics[["trip_uuid","osrm_time"]]
+time_taken_btwn_odstart_and_od_end = trip_metrics[["trip_uuid","time_taken_btwn_odstart_and_od_end"]]
+start_scan_to_end_scan = trip_metrics[["trip_uuid","start_scan_to_end_scan"]]
+osrm_distance = trip_metrics[["trip_uuid","osrm_distance"]]
+actual_distance_to_destination = trip_metrics[["trip_uuid","actual_distance_to_destination"]]
+segment_osrm_distance = trip_metrics[["trip_uuid","segment_osrm_distance"]]
 
 
 # ================================================================================
@@ -1387,26 +1299,22 @@ actual_distance_to_destination["actual_distance_to_destination"].mean(),actual_d
 # CODE CELL 161
 # ================================================================================
 
-distances = segment_osrm_distance.merge(actual_distance_to_destination.merge(osrm_distance,
-                                                                             on="trip_uuid"),
-                                                                            on="trip_uuid")
+distances = trip_metrics[["trip_uuid","segment_osrm_distance","actual_distance_to_destination","osrm_distance"]]
 
 
 # ================================================================================
 # CODE CELL 162
 # ================================================================================
 
-time = segment_osrm_time.merge(osrm_time.merge(segment_actual_time.merge(actual_time.merge(time_taken_btwn_odstart_and_od_end.merge(start_scan_to_end_scan,
-                                         on="trip_uuid",
-                                         ),on="trip_uuid"),on="trip_uuid"),on="trip_uuid"),on="trip_uuid")
+time = trip_metrics[["trip_uuid","segment_osrm_time","osrm_time","segment_actual_time","actual_time",
+                     "time_taken_btwn_odstart_and_od_end","start_scan_to_end_scan"]]
 
 
 # ================================================================================
 # CODE CELL 163
 # ================================================================================
 
-Merge1 = time.merge(distances,on="trip_uuid",
-                                        )
+Merge1 = trip_metrics.drop(columns="route_type")
 
 
 # ================================================================================
@@ -1489,28 +1397,9 @@ Merge1
 # CODE CELL 175
 # ================================================================================
 
-city = data.groupby("trip_uuid")[["source_city",
-                                  "destination_city"]].aggregate({
-        "source_city":pd.unique,
-    "destination_city":pd.unique,
-})
-
-state = data.groupby("trip_uuid")[["source_state",
-                                   "destination_state"]].aggregate({
-        "source_state":pd.unique,
-    "destination_state":pd.unique,
-})
-
-city_state = data.groupby("trip_uuid")[["source_city_state",
-                                        "destination_city_state"]].aggregate({
-        "source_city_state":pd.unique,
-    "destination_city_state":pd.unique,
-})
-
-locations = city.merge(city_state.merge(state,on="trip_uuid"
-                            ,how="outer"),
-           on="trip_uuid",
-           how="outer")
+# First source and last destination of each trip (typed first/last reductions,
+# not list-valued pd.unique aggregates that need string cleaning later)
+locations = trip_locations(data)
 
 
 # ================================================================================
@@ -1524,7 +1413,7 @@ locations = city.merge(city_state.merge(state,on="trip_uuid"
 # CODE CELL 177
 # ================================================================================
 
-route_type = data.groupby("trip_uuid")["route_type"].unique().reset_index()
+route_type = data.groupby("trip_uuid", observed=True)["route_type"].first().reset_index()
 
 
 # ================================================================================
@@ -1549,14 +1438,14 @@ trip_records = Merged.copy()
 # CODE CELL 180
 # ================================================================================
 
-trip_records["route_type"] = trip_records["route_type"].apply(lambda x:x[0])
+# route_type is already a scalar per trip
 
 
 # ================================================================================
 # CODE CELL 181
 # ================================================================================
 
-route_to_merge = data.groupby("trip_uuid")["route_schedule_uuid"].unique().reset_index()
+route_to_merge = data.groupby("trip_uuid", observed=True)["route_schedule_uuid"].first().reset_index()
 
 
 # ================================================================================
@@ -1570,7 +1459,7 @@ trip_records = trip_records.merge(route_to_merge,on="trip_uuid",how="outer")
 # CODE CELL 183
 # ================================================================================
 
-trip_records["route_schedule_uuid"] = trip_records["route_schedule_uuid"].apply(lambda x:x[0])
+# route_schedule_uuid is already a scalar per trip
 
 
 # ================================================================================
@@ -1633,7 +1522,9 @@ trip_records[trip_records["trip_uuid"]=="trip-153852612674280168"]
 # CODE CELL 192
 # ================================================================================
 
-trip_records.dropna(axis= 0,how = 'any',inplace = True)
+# Drop trips missing from the numeric aggregates; a trip whose source/destination
+# names are all missing keeps NaN locations instead of being dropped
+trip_records.dropna(axis= 0,how = 'any',subset=trip_records.columns.difference(LOCATION_COLUMNS),inplace = True)
 
 
 # ================================================================================
@@ -1647,13 +1538,7 @@ trip_records.dropna(axis= 0,how = 'any',inplace = True)
 # CODE CELL 194
 # ================================================================================
 
-trip_records["source_city"] = trip_records["source_city"].astype("str").str.strip("[]").str.replace("'","")
-trip_records["destination_city"] = trip_records["destination_city"].astype("str").str.strip("[]").str.replace("'","")
-trip_records["source_city_state"] = trip_records["source_city_state"].astype("str").str.strip("[]").str.replace("'","")
-trip_records["destination_city_state"] = trip_records["destination_city_state"].astype("str").str.strip("[]").str.replace("'","")
-
-trip_records["source_state"] = trip_records["source_state"].astype("str").str.strip("[]").str.replace("'","")
-trip_records["destination_state"] = trip_records["destination_state"].astype("str").str.strip("[]").str.replace("'","")
+# Location columns are plain strings already; no repr stripping needed
 
 
 # ================================================================================
@@ -1857,28 +1742,15 @@ sc_dc = trip_records_without_outliers.groupby(["destination_source_locations"])[
 # CODE CELL 219
 # ================================================================================
 
-def get_cat(H):
-    if 0 <= H <= 50:
-        return "Category 7"
-    elif 51 <= H <= 100:
-        return "Category 6"
-    elif 101 <= H <= 200:
-        return "Category 5"
-    elif 201 <= H <= 300:
-        return "Category 4"
-    elif 301 <= H <= 400:
-        return "Category 3"
-    elif 401 <= H <= 500:
-        return "Category 2"
-    else:
-        return "Category 1"
+# Trips per corridor binned into "Category 7" (up to 50) .. "Category 1" (over 500);
+# contiguous right-closed bins, so non-integer values no longer fall through to Category 1
 
 
 # ================================================================================
 # CODE CELL 220
 # ================================================================================
 
-sc_dc["city"]  = pd.Series(map(get_cat,sc_dc["trip_uuid"]))
+sc_dc["city"]  = bucketize(sc_dc["trip_uuid"])
 
 
 # ================================================================================
@@ -2045,133 +1917,9 @@ Min_Max_Scaled_Data.sample(5)
 # CODE CELL 239
 # ================================================================================
 
-A = data.groupby("route_schedule_uuid")["route_type"].unique().reset_index()
-B = data.groupby("route_schedule_uuid")["destination_city"].unique().reset_index()
-B.columns = ["route_schedule_uuid","destination_cities"]
-C = data.groupby("route_schedule_uuid")["source_city"].unique().reset_index()
-C.columns = ["route_schedule_uuid","source_cities"]
-D = data.groupby("route_schedule_uuid")["source_state"].unique().reset_index()
-D.columns = ["route_schedule_uuid","source_states"]
-E = data.groupby("route_schedule_uuid")["destination_state"].unique().reset_index()
-E.columns = ["route_schedule_uuid","destination_states"]
-F = data.groupby("route_schedule_uuid")[["source_state",
-                                         "destination_state"]].nunique().sort_values(by="source_state",
-                                                                                     ascending=False).reset_index()
-F.columns = ["route_schedule_uuid","#source_states"
-             ,"#destination_states"]
-G = trip_records.groupby("route_schedule_uuid")["actual_distance_to_destination"].mean().reset_index()
-G.columns = ["route_schedule_uuid","Average_Actual_distance_to_destination"]
-H = trip_records["route_schedule_uuid"].value_counts().reset_index()
-H.columns = ["route_schedule_uuid","Number_of_Trips"]
-
-
-# ================================================================================
-# CODE CELL 240
-# ================================================================================
-
-I = data.groupby("route_schedule_uuid")[["source_city",
-                                         "destination_city"]].nunique().sort_values(by="source_city",
-                                                                                     ascending=False).reset_index()
-I.columns = ["route_schedule_uuid","#source_cities"
-             ,"#destination_cities"]
-
-
-# ================================================================================
-# CODE CELL 241
-# ================================================================================
-
-route_records = I.merge(H.merge(G.merge(F.merge(E.merge(D.merge(C.merge(A.merge(B,
-        on ="route_schedule_uuid",
-        how = "outer"),on ="route_schedule_uuid",
-        how = "outer"),
-       on ="route_schedule_uuid",
-        how = "outer"),
-       on ="route_schedule_uuid",
-        how = "outer"),
-       on ="route_schedule_uuid",
-        how = "outer"),
-       on ="route_schedule_uuid",
-        how = "outer"),
-       on ="route_schedule_uuid",
-        how = "outer"),on ="route_schedule_uuid",
-        how = "outer")
-
-
-# ================================================================================
-# CODE CELL 242
-# ================================================================================
-
-# route_records.sort_values(by="Average_Actual_distance_to_destination",ascending=False)
-
-
-# ================================================================================
-# CODE CELL 243
-# ================================================================================
-
-route_records.isna().sum()
-
-
-# ================================================================================
-# CODE CELL 244
-# ================================================================================
-
-route_records.dropna(inplace=True)
-
-
-# ================================================================================
-# CODE CELL 245
-# ================================================================================
-
-route_records["route_type"] = route_records["route_type"].astype("str").str.strip("[]").str.replace("'","")
-route_records["source_cities"] = route_records["source_cities"].astype("str").str.strip("[]").str.replace("'","")
-route_records["destination_cities"] = route_records["destination_cities"].astype("str").str.strip("[]").str.replace("'","")
-route_records["source_states"] = route_records["source_states"].astype("str").str.strip("[]").str.replace("'","")
-                             
-route_records["destination_states"] = route_records["destination_states"].astype("str").str.strip("[]").str.replace("'","")                        
-
-
-# ================================================================================
-# CODE CELL 246
-# ================================================================================
-
-route_records
-
-
-# ================================================================================
-# CODE CELL 247
-# ================================================================================
-
-route_records["ROUTE"] = route_records["source_cities"] + " -- " + route_records["destination_cities"]
-
-
-# ================================================================================
-# CODE CELL 248
-# ================================================================================
-
-route_records.drop(["route_schedule_uuid"],axis = 1,inplace=True)
-
-
-# ================================================================================
-# CODE CELL 249
-# ================================================================================
-
-first_column = route_records.pop('ROUTE')
-route_records.insert(0, 'ROUTE', first_column) 
-
-
-# ================================================================================
-# CODE CELL 250
-# ================================================================================
-
-route_records["SouceToDestination_city"] = route_records["source_cities"].str.split(" ").apply(lambda x:x[0]) +" TO " +route_records["destination_cities"].str.split(" ").apply(lambda x:x[-1])
-
-
-# ================================================================================
-# CODE CELL 251
-# ================================================================================
-
-first_column = route_records.pop('SouceToDestination_city')
-route_records.insert(0, 'SouceToDestination_city', first_column) 
+# One pass over the segments: every list column shares one factorization of
+# route_schedule_uuid, trip counts and mean distance come from trip_records
+route_records = build_route_records(data, trip_records)
 
 
 # ================================================================================
@@ -2247,8 +1995,8 @@ route_records.to_csv("route_records.csv")
 # CODE CELL 262
 # ================================================================================
 
-Number_of_trips_between_cities = data.groupby(["source_city_state",
-                                               "destination_city_state"])["trip_uuid"].nunique().sort_values(ascending=False).reset_index()
+Number_of_trips_between_cities = distinct_counts(data[["source_city_state", "destination_city_state"]],
+                                                 data["trip_uuid"]).sort_values(ascending=False).reset_index()
 Number_of_trips_between_cities.head(25)
 
 
@@ -2577,8 +2325,10 @@ plt.show()
 # CODE CELL 300
 # ================================================================================
 
-highest_order_between_states = data.groupby(["source_state",
-                                             "destination_state"])["trip_uuid"].nunique().sort_values(ascending=False).reset_index()
+# Corridor cube built once; state_trips sums to exact distinct trips per state pair
+corridors = corridor_cube(data)
+highest_order_between_states = slice_corridors(corridors, ["source_state", "destination_state"],
+                                               "state_trips")[["source_state", "destination_state", "state_trips"]]
 
 
 # ================================================================================
@@ -2601,7 +2351,7 @@ plt.show()
 # CODE CELL 302
 # ================================================================================
 
-HOBS = data.groupby(["source_state","destination_state"])["trip_uuid"].nunique().sort_values(ascending=False).reset_index()
+HOBS = highest_order_between_states.copy()
 HOBS = HOBS[HOBS["source_state"]!=HOBS["destination_state"]].head(20)
 
 HOBS["souce-destination"] = HOBS["source_state"] + " - " + HOBS["destination_state"]
@@ -2634,8 +2384,8 @@ plt.show()
 # CODE CELL 305
 # ================================================================================
 
-destination_traffic = data.groupby(["destination_city_state"])["trip_uuid"].nunique().reset_index()
-source_traffic = data.groupby(["source_city_state"])["trip_uuid"].nunique().reset_index()
+destination_traffic = distinct_counts(data["destination_city_state"], data["trip_uuid"]).reset_index()
+source_traffic = distinct_counts(data["source_city_state"], data["trip_uuid"]).reset_index()
 transactions = source_traffic.merge(destination_traffic,
                                left_on="source_city_state"
                                ,right_on="destination_city_state")
@@ -9,10 +9,15 @@ from plotly.subplots import make_subplots
 import logging
 from datetime import datetime
 from scipy import stats
-from scipy.stats import ttest_ind, ks_2samp
 from sklearn.preprocessing import MinMaxScaler, StandardScaler
 import warnings
 
+from delhivery import (
+    CONFIDENCE_LEVEL, DENSITY_BINS, HYPOTHESIS_TESTS, REGRESSION_PAIRS, StatisticsCache, bucketize,
+    build_route_records, combined_segments, compact_trip_records, confidence_band, corridor_cube,
+    load_store, load_trip_tables, memory_report, regression_moments, slice_corridors, store_mtime, store_version,
+)
+
 warnings.filterwarnings('ignore')
 
 # Configure logging
@@ -101,12 +106,15 @@ st.markdown("""
         font-size: 0.75rem !important;
     }
     
+    /* Section navigation (a horizontal radio) and the in-section tabs share one look */
+    .st-key-active_tab [data-testid="stRadioGroup"],
     .stTabs [data-baseweb="tab-list"] { 
         gap: 12px; 
         background-color: rgba(17, 24, 39, 0.5);
         padding: 0.5rem;
         border-radius: 12px;
     }
+    .st-key-active_tab [data-testid="stRadioOption"],
     .stTabs [data-baseweb="tab"] {
         background: linear-gradient(135deg, rgba(139, 92, 246, 0.1) 0%, rgba(244, 114, 182, 0.1) 100%);
         color: #a78bfa; 
@@ -116,17 +124,23 @@ st.markdown("""
         transition: all 0.3s ease; 
         border: 1px solid rgba(139, 92, 246, 0.3);
     }
+    .st-key-active_tab [data-testid="stRadioOption"]:hover,
     .stTabs [data-baseweb="tab"]:hover { 
         background: linear-gradient(135deg, rgba(139, 92, 246, 0.2) 0%, rgba(244, 114, 182, 0.2) 100%);
         transform: translateY(-2px); 
         box-shadow: 0 4px 12px rgba(139, 92, 246, 0.4);
     }
+    .st-key-active_tab [data-testid="stRadioOption"][data-selected="true"],
     .stTabs [aria-selected="true"] {
         background: linear-gradient(135deg, #8b5cf6 0%, #ec4899 100%) !important; 
         color: white !important; 
         box-shadow: 0 6px 20px rgba(139, 92, 246, 0.6);
         transform: translateY(-2px);
     }
+    .st-key-active_tab [data-testid="stRadioGroup"] { flex-wrap: wrap; }
+    .st-key-active_tab [data-testid="stRadioOption"] { cursor: pointer; }
+    .st-key-active_tab [data-testid="stRadioOption"] > div > div:first-child { display: none; }
+    .st-key-active_tab [data-testid="stRadioOption"][data-selected="true"] p { color: white !important; }
     
     [data-testid="stSidebar"] { 
         background: linear-gradient(180deg, #1e1b4b 0%, #312e81 100%); 
@@ -333,94 +347,48 @@ with st.sidebar:
     """, unsafe_allow_html=True)
 
 # Load and preprocess data
-@st.cache_data
-def load_data():
+# Loaded once per process and shared by every session and rerun: st.cache_resource hands out the same
+# objects instead of unpickling a fresh copy each time like st.cache_data, so the returned frames are
+# read-only. store_mtime keys the cache, so files appended to the incremental store show up on the next
+# rerun; only the latest load is kept
+@st.cache_resource(max_entries=1)
+def load_data(store_mtime):
     logger.info("Loading dataset...")
     try:
-        df = pd.read_csv("delhivery_data.csv")
-        logger.info(f"Dataset loaded: {df.shape}")
-        
-        # Preprocessing
-        df["od_end_time"] = pd.to_datetime(df["od_end_time"])
-        df["od_start_time"] = pd.to_datetime(df["od_start_time"])
-        df["trip_creation_time"] = pd.to_datetime(df["trip_creation_time"])
-        
-        df["trip_creation_day"] = df["trip_creation_time"].dt.day_name()
-        df["trip_creation_month"] = df["trip_creation_time"].dt.month_name()
-        df["trip_creation_year"] = df["trip_creation_time"].dt.year
-        
-        # Extracting City and State
-        df["source_city"] = df["source_name"].str.split(" ",n=1,expand=True)[0].str.split("_",n=1,expand=True)[0]
-        df["source_state"] = df["source_name"].str.split(" ",n=1,expand=True)[1].str.replace("(","").str.replace(")","")
-        df["destination_city"] = df["destination_name"].str.split(" ",n=1,expand=True)[0].str.split("_",n=1,expand=True)[0]
-        df["destination_state"] = df["destination_name"].str.split(" ",n=1,expand=True)[1].str.replace("(","").str.replace(")","")
-        
-        # Time calculations
-        df["time_taken_btwn_odstart_and_od_end"] = ((df["od_end_time"]-df["od_start_time"])/pd.Timedelta(1,unit="hour"))
-        
-        # Convert to hours
-        for col in ["start_scan_to_end_scan", "actual_time", "osrm_time", "segment_actual_time", "segment_osrm_time"]:
-            df[col] = df[col]/60
-            
-        # Cleaning State Names
-        replacements = {
-            "Goa Goa":"Goa", "Layout PC Karnataka":"Karnataka", "Vadgaon Sheri DPC Maharashtra":"Maharashtra",
-            "Pashan DPC Maharashtra":"Maharashtra", "City Madhya Pradesh":"Madhya Pradesh", "02_DPC Uttar Pradesh":"Uttar Pradesh",
-            "Nagar_DC Rajasthan":"Rajasthan", "Alipore_DPC West Bengal":"West Bengal", "Mandakni Madhya Pradesh":"Madhya Pradesh",
-            "West _Dc Maharashtra":"Maharashtra", "DC Rajasthan":"Rajasthan", "MP Nagar Madhya Pradesh":"Madhya Pradesh",
-            "Antop Hill Maharashtra":"Maharashtra", "Avenue_DPC West Bengal":"West Bengal", "Nagar Uttar Pradesh":"Uttar Pradesh",
-            "Balaji Nagar Maharashtra":"Maharashtra", "Kothanur_L Karnataka":"Karnataka", "Rahatani DPC Maharashtra":"Maharashtra",
-            "Mahim Maharashtra":"Maharashtra", "DC Maharashtra":"Maharashtra", "_NAD Andhra Pradesh":"Andhra Pradesh",
-            "Delhi Delhi":"Delhi", "West_Dc Maharashtra":"Maharashtra", "Hub Maharashtra":"Maharashtra"
-        }
-        df["source_state"] = df["source_state"].replace(replacements)
-        df["destination_state"] = df["destination_state"].replace(replacements)
-        
-        # Cleaning City Names
-        df["destination_city"].replace({"del":"Delhi", "Bangalore":"Bengaluru", "AMD":"Ahmedabad", "Amdavad":"Ahmedabad"}, inplace=True)
-        df["source_city"].replace({"del":"Delhi", "Bangalore":"Bengaluru", "AMD":"Ahmedabad", "Amdavad":"Ahmedabad"}, inplace=True)
-        
-        df["source_city_state"] = df["source_city"] + " " + df["source_state"]
-        df["destination_city_state"] = df["destination_city"] + " " + df["destination_state"]
-        
-        # Aggregation
-        data = df.copy()
-        
-        actual_time = data.groupby(["trip_uuid", "start_scan_to_end_scan"])["actual_time"].max().reset_index().groupby("trip_uuid")["actual_time"].sum().reset_index()
-        segment_osrm_time = data[["trip_uuid","segment_osrm_time"]].groupby("trip_uuid")["segment_osrm_time"].sum().reset_index()
-        segment_actual_time = data.groupby("trip_uuid")["segment_actual_time"].sum().reset_index()
-        osrm_time = data.groupby(["trip_uuid", "start_scan_to_end_scan"])["osrm_time"].max().reset_index().groupby("trip_uuid")["osrm_time"].sum().reset_index()
-        
-        time_taken = data.groupby("trip_uuid")["time_taken_btwn_odstart_and_od_end"].unique().reset_index()
-        time_taken["time_taken_btwn_odstart_and_od_end"] = time_taken["time_taken_btwn_odstart_and_od_end"].apply(sum)
-        
-        start_scan = data.groupby("trip_uuid")["start_scan_to_end_scan"].unique().reset_index()
-        start_scan["start_scan_to_end_scan"] = start_scan["start_scan_to_end_scan"].apply(sum)
-        
-        osrm_distance = data.groupby(["trip_uuid", "start_scan_to_end_scan"])["osrm_distance"].max().reset_index().groupby("trip_uuid")["osrm_distance"].sum().reset_index()
-        actual_distance = data.groupby(["trip_uuid", "start_scan_to_end_scan"])["actual_distance_to_destination"].max().reset_index().groupby("trip_uuid")["actual_distance_to_destination"].sum().reset_index()
-        segment_osrm_distance = data[["trip_uuid", "segment_osrm_distance"]].groupby("trip_uuid")["segment_osrm_distance"].sum().reset_index()
-        
-        # Merging
-        distances = segment_osrm_distance.merge(actual_distance.merge(osrm_distance, on="trip_uuid"), on="trip_uuid")
-        time = segment_osrm_time.merge(osrm_time.merge(segment_actual_time.merge(actual_time.merge(time_taken.merge(start_scan, on="trip_uuid"), on="trip_uuid"), on="trip_uuid"), on="trip_uuid"), on="trip_uuid")
-        
-        trip_records = time.merge(distances, on="trip_uuid")
-        
-        route_type = data.groupby("trip_uuid")["route_type"].unique().reset_index()
-        trip_records = trip_records.merge(route_type, on="trip_uuid")
-        trip_records["route_type"] = trip_records["route_type"].apply(lambda x:x[0])
-        
-        logger.info("Preprocessing completed")
-        return df, trip_records
+        # Featurized segments and trip_records from the on-disk artifact shared by
+        # all workers; rebuilt from the snapshot/CSV only when data or code changes
+        df, trip_records, data_version = load_trip_tables("dashboard", return_version=True)
+        # A store from `python -m delhivery.incremental` holds the full history plus the appended files;
+        # a stale one is ignored here and rebuilt by the next append, never in the request path
+        store = load_store(version=data_version, rebuild=False) if store_mtime is not None else None
+        if store is not None:
+            df = combined_segments(df, store)
+            trip_records = store["trip_records"].copy()
+            data_version = f"{data_version}-{store_version(store)}"
+            logger.info(f"Trip store loaded: {len(store['sources'])} files appended")
+        logger.info(f"Dataset loaded: {df.shape}, {len(trip_records)} trips")
+        route_records = build_route_records(df, trip_records)
+        logger.info(f"Route records built: {len(route_records)} routes")
+        trip_records["distance_category"] = bucketize(trip_records["actual_distance_to_destination"])
+        route_records["distance_category"] = bucketize(route_records["Average_Actual_distance_to_destination"])
+        # Corridor charts slice this cube instead of scanning the segments on every rerun
+        corridors = corridor_cube(df)
+        logger.info(f"Corridor cube built: {len(corridors)} cells")
+        # Trendline sums per route type and distance category, taken from the float64 trips before compaction
+        trip_moments = regression_moments(trip_records, REGRESSION_PAIRS, by=["route_type", "distance_category"])
+        
+        # Categorical ids/route types and float32 metrics, held once for all sessions
+        trip_records = compact_trip_records(trip_records)
+        logger.info(f"trip_records memory:\n{memory_report(trip_records)}")
+        return df, trip_records, route_records, corridors, trip_moments, data_version
     
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         st.error(f"Error loading data: {str(e)}")
-        return None, None
+        return None, None, None, None, None, None
 
 try:
-    df, trip_records = load_data()
+    df, trip_records, route_records, corridors, trip_moments, data_version = load_data(store_mtime())
     if df is not None:
         logger.info("Data ready")
     else:
@@ -430,22 +398,112 @@ except Exception as e:
     st.error("❌ Failed to load data")
     st.stop()
 
-# Main Tabs
-tabs = st.tabs([
-    "📊 Problem Statement",
-    "📝 Methodology",
-    "🔍 Interactive EDA", 
-    "🛠️ Feature Engineering",
-    "🔬 Hypothesis Testing",
-    "💡 Insights & Recommendations",
-    "📚 Complete Analysis",
-    "📝 Logs"
-])
+# Summary statistics shared by all tabs and sessions, keyed by data_version
+@st.cache_resource
+def statistics_cache():
+    return StatisticsCache()
+
+stats_cache = statistics_cache()
+
+# Memoized heavy computations, keyed by data_version (underscored frames are not hashed)
+@st.cache_data
+def scaled_features(data_version, columns, _trip_records):
+    scaled = StandardScaler().fit_transform(_trip_records[list(columns)].dropna())
+    return pd.DataFrame(scaled, columns=[f"{col}_scaled" for col in columns])
+
+@st.cache_data
+def zscore_inliers(data_version, columns, _trip_records):
+    # Mask and rows come from the same subset, so NaNs in other columns cannot shift the selection
+    subset = _trip_records.dropna(subset=list(columns))
+    z_scores = stats.zscore(subset[list(columns)].to_numpy())
+    return subset[(np.abs(z_scores) < 3).all(axis=1)]
+
+# Histograms are binned server-side; the browser only receives one bar per bin
+def histogram_bars(table, frame, column, name, color, bins=50, range=None, opacity=0.7):
+    hist = stats_cache.histogram(data_version, table, frame, column, bins, range)
+    return go.Bar(
+        x=(hist['left'] + hist['right']) / 2, y=hist['count'], width=hist['right'] - hist['left'],
+        name=name, marker_color=color, opacity=opacity
+    )
+
+def shared_range(table, frame, columns):
+    summary = stats_cache.describe(data_version, table, frame, columns)
+    return summary.loc['min'].min(), summary.loc['max'].max()
+
+# Distinct trips per source or destination state, read from the corridor cube
+def state_trips(column, n):
+    measure = f'{column}_trips'
+    return slice_corridors(corridors, column, measure).set_index(column)[measure].head(n)
+
+# Box and violin plots are drawn from cached quartiles, whisker ends, outlier samples and KDE curves
+def box_traces(table, frame, column, name, color, x=None, width=None):
+    summary = stats_cache.box(data_version, table, frame, column)
+    x = name if x is None else x
+    box = go.Box(
+        x=[x], q1=[summary['q1']], median=[summary['median']], q3=[summary['q3']],
+        lowerfence=[summary['lowerfence']], upperfence=[summary['upperfence']], mean=[summary['mean']],
+        name=name, marker_color=color, boxpoints=False, width=width
+    )
+    outliers = go.Scatter(
+        x=[x] * len(summary['outliers']), y=summary['outliers'], mode='markers', name=name,
+        marker=dict(color=color, size=4, opacity=0.6), showlegend=False, hoverinfo='y'
+    )
+    return [box, outliers]
+
+def violin_traces(table, frame, column, name, color, position):
+    curve = stats_cache.kde(data_version, table, frame, column)
+    half_width = 0.4 * curve['density'].to_numpy() / max(curve['density'].max(), 1e-12)
+    shape = go.Scatter(
+        x=np.r_[position - half_width, (position + half_width)[::-1]],
+        y=np.r_[curve['value'], curve['value'][::-1]],
+        fill='toself', fillcolor=color, opacity=0.6, line=dict(color=color), name=name, hoverinfo='skip'
+    )
+    box, _ = box_traces(table, frame, column, name, '#e2e8f0', x=position, width=0.06)
+    box.update(boxmean=True, showlegend=False)
+    return [shape, box]
+
+
+# Scatter plots are drawn as a density raster of every trip, binned and cached server-side, with an
+# OLS trendline and confidence band from the per-group sums in trip_moments (filter keys must be among its groups)
+def density_traces(table, frame, x, y, bins=DENSITY_BINS, filter=()):
+    grid = stats_cache.density(data_version, table, frame, x, y, bins, filter=filter)
+    counts = grid.to_numpy()
+    # log10 counts quantized to levels 1..255 (uint8 keeps the payload small); empty cells stay 0 and transparent
+    top = max(np.log10(max(counts.max(), 1)), 1.0)
+    levels = np.zeros(counts.shape, dtype=np.uint8)
+    occupied = counts > 0
+    levels[occupied] = 1 + np.round(254 * np.log10(counts[occupied]) / top).astype(np.uint8)
+    viridis = px.colors.sequential.Viridis
+    colorscale = [[0, 'rgba(0,0,0,0)'], [0.5 / 255, 'rgba(0,0,0,0)']] + [
+        [1 / 255 + (254 / 255) * i / (len(viridis) - 1), color] for i, color in enumerate(viridis)
+    ]
+    colorscale[2][0] = 0.5 / 255
+    decades = range(int(np.floor(top)) + 1)
+    heatmap = go.Heatmap(
+        x=grid.columns.to_numpy(), y=grid.index.to_numpy(), z=levels, zmin=0, zmax=255,
+        colorscale=colorscale, name='Trips', hoverinfo='x+y',
+        colorbar=dict(title='Trips', tickvals=[1 + 254 * d / top for d in decades],
+                      ticktext=[f'{10 ** d:,}' for d in decades])
+    )
+
+    fit = stats_cache.regression(data_version, 'trip_moments', trip_moments, x, y, filter)
+    if not np.isfinite(fit['slope']):
+        return [heatmap]
+    band = confidence_band(fit, np.linspace(grid.columns[0], grid.columns[-1], 50))
+    interval = go.Scatter(
+        x=np.r_[band['x'], band['x'][::-1]], y=np.r_[band['upper'], band['lower'][::-1]],
+        fill='toself', fillcolor='rgba(245, 158, 11, 0.25)', line=dict(width=0),
+        name=f'{CONFIDENCE_LEVEL:.0%} Confidence Band', hoverinfo='skip'
+    )
+    line = go.Scatter(
+        x=band['x'], y=band['fit'], mode='lines', line=dict(color='#f59e0b', width=2),
+        name=f"OLS Fit (y = {fit['slope']:.2f}x + {fit['intercept']:.2f}, R² = {fit['r_squared']:.3f})"
+    )
+    return [heatmap, interval, line]
 
-logger.info("Main tabs created")
 
 # TAB 1: Problem Statement
-with tabs[0]:
+def render_problem_statement():
     st.header("📊 About Delhivery & Problem Statement")
     logger.info("Problem Statement tab accessed")
     
@@ -632,7 +690,7 @@ with tabs[0]:
         st.dataframe(df.head(10), use_container_width=True)
 
 # TAB 2: Methodology
-with tabs[1]:
+def render_methodology():
     st.header("📝 Solution Approach & Methodology")
     
     # Introduction
@@ -722,7 +780,7 @@ with tabs[1]:
         """, unsafe_allow_html=True)
 
 # TAB 3: Interactive EDA
-with tabs[2]:
+def render_eda():
     st.header("🔍 Interactive Exploratory Data Analysis")
     logger.info("Interactive EDA tab accessed")
     
@@ -747,17 +805,17 @@ with tabs[2]:
             st.markdown("**Numerical Features Summary (Aggregated Trips)**")
             st.caption("Key statistics for time and distance metrics across all trips.")
             numerical_cols = ['actual_time', 'osrm_time', 'actual_distance_to_destination', 'osrm_distance']
-            st.dataframe(trip_records[numerical_cols].describe().T, use_container_width=True)
+            st.dataframe(stats_cache.describe(data_version, 'trip_records', trip_records, numerical_cols).T, use_container_width=True)
         
         with col2:
             st.markdown("**Categorical Features**")
             st.caption("Breakdown of key categorical variables like Route Type and States.")
             cat_summary = []
             for col in ['route_type', 'source_state', 'destination_state']:
-                value_counts = df[col].value_counts()
+                value_counts = stats_cache.value_counts(data_version, 'df', df, col)
                 cat_summary.append({
                     'Feature': col,
-                    'Unique': df[col].nunique(),
+                    'Unique': int((value_counts > 0).sum()),
                     'Most Common': value_counts.index[0],
                     'Frequency': value_counts.values[0]
                 })
@@ -780,7 +838,7 @@ with tabs[2]:
         with col1:
             st.markdown("**🚚 Route Type Distribution**")
             st.caption("Proportion of FTL vs Carting trips.")
-            route_counts = trip_records['route_type'].value_counts()
+            route_counts = stats_cache.value_counts(data_version, 'trip_records', trip_records, 'route_type')
             fig = go.Figure(data=[go.Pie(
                 labels=route_counts.index,
                 values=route_counts.values,
@@ -802,7 +860,7 @@ with tabs[2]:
         with col2:
             st.markdown("**⏱️ Average Time by Route Type**")
             st.caption("Comparison of average actual delivery time (in hours) for each route type.")
-            route_time = trip_records.groupby('route_type')['actual_time'].mean().reset_index()
+            route_time = trip_records.groupby('route_type', observed=True)['actual_time'].mean().reset_index()
             fig = go.Figure(data=[go.Bar(
                 x=route_time['route_type'],
                 y=route_time['actual_time'],
@@ -820,6 +878,36 @@ with tabs[2]:
                 margin=dict(t=20, b=0, l=0, r=0)
             )
             st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("**🛣️ Busiest Routes**")
+        st.caption("Routes with the most trips, with their average actual distance to destination (km).")
+        distance_categories = st.multiselect(
+            "Distance category",
+            options=list(route_records['distance_category'].cat.categories),
+            default=list(route_records['distance_category'].cat.categories),
+            help="Category 7: up to 50 km, 6: 50-100 km, 5: 100-200 km, ... 1: over 500 km"
+        )
+        routes_shown = route_records[route_records['distance_category'].isin(distance_categories)]
+        busiest = routes_shown.nlargest(10, 'Number_of_Trips').iloc[::-1]
+        fig = go.Figure(data=[go.Bar(
+            x=busiest['Number_of_Trips'],
+            y=busiest['SouceToDestination_city'],
+            orientation='h',
+            marker=dict(color=busiest['Average_Actual_distance_to_destination'], colorscale='Purples',
+                        colorbar=dict(title='Avg km')),
+            customdata=busiest[['ROUTE', 'Average_Actual_distance_to_destination']],
+            hovertemplate='<b>%{customdata[0]}</b><br>Trips: %{x}<br>Avg distance: %{customdata[1]:.1f} km<extra></extra>'
+        )])
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#cbd5e1'),
+            height=400,
+            xaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title='Number of Trips'),
+            yaxis=dict(showgrid=False),
+            margin=dict(t=20, b=0, l=0, r=0)
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
     with viz_tabs[2]:
         st.subheader("Temporal Patterns")
@@ -838,7 +926,7 @@ with tabs[2]:
         with col1:
             st.markdown("**📅 Trips by Day of Week**")
             st.caption("Distribution of trips across different days to identify weekly patterns.")
-            day_counts = df['trip_creation_day'].value_counts()
+            day_counts = stats_cache.value_counts(data_version, 'df', df, 'trip_creation_day')
             fig = go.Figure(data=[go.Bar(
                 x=day_counts.index,
                 y=day_counts.values,
@@ -859,7 +947,7 @@ with tabs[2]:
         with col2:
             st.markdown("**📅 Trips by Month**")
             st.caption("Monthly trip volume showing seasonal trends and demand fluctuations.")
-            month_counts = df['trip_creation_month'].value_counts().sort_index()
+            month_counts = stats_cache.value_counts(data_version, 'df', df, 'trip_creation_month').sort_index()
             fig = go.Figure(data=[go.Bar(
                 x=month_counts.index,
                 y=month_counts.values,
@@ -893,8 +981,8 @@ with tabs[2]:
         
         with col1:
             st.markdown("**🗺️ Top 10 Source States**")
-            st.caption("States with the highest number of outgoing shipments.")
-            state_counts = df['source_state'].value_counts().head(10)
+            st.caption("States with the highest number of distinct outgoing trips.")
+            state_counts = state_trips('source_state', 10)
             fig = px.bar(
                 x=state_counts.index, 
                 y=state_counts.values,
@@ -915,8 +1003,8 @@ with tabs[2]:
             
         with col2:
             st.markdown("**🎯 Top 10 Destination States**")
-            st.caption("States receiving the most incoming shipments.")
-            dest_counts = df['destination_state'].value_counts().head(10)
+            st.caption("States receiving the most distinct incoming trips.")
+            dest_counts = state_trips('destination_state', 10)
             fig = px.bar(
                 x=dest_counts.index, 
                 y=dest_counts.values,
@@ -935,6 +1023,31 @@ with tabs[2]:
             fig.update_traces(textposition='outside')
             st.plotly_chart(fig, use_container_width=True)
         
+        st.markdown("**🔀 Busiest Interstate Corridors**")
+        st.caption("Source → destination state pairs with the most trips, with the average actual vs OSRM time per trip (in hours).")
+        pairs = slice_corridors(corridors, ['source_state', 'destination_state'], 'state_trips')
+        pairs = pairs[pairs['source_state'] != pairs['destination_state']].head(10).iloc[::-1]
+        labels = pairs['source_state'].astype(str) + ' → ' + pairs['destination_state'].astype(str)
+        fig = go.Figure(data=[
+            go.Bar(y=labels, x=pairs['mean_actual_time'], name='Actual Time', orientation='h',
+                   marker_color='#fb923c', customdata=pairs['state_trips'],
+                   hovertemplate='<b>%{y}</b><br>Trips: %{customdata}<br>Actual: %{x:.1f} hrs<extra></extra>'),
+            go.Bar(y=labels, x=pairs['mean_osrm_time'], name='OSRM Time', orientation='h',
+                   marker_color='#667eea', customdata=pairs['state_trips'],
+                   hovertemplate='<b>%{y}</b><br>Trips: %{customdata}<br>OSRM: %{x:.1f} hrs<extra></extra>'),
+        ])
+        fig.update_layout(
+            barmode='group',
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#cbd5e1'),
+            height=450,
+            xaxis=dict(showgrid=True, gridcolor='rgba(139, 92, 246, 0.1)', title='Avg Time (Hours)'),
+            yaxis=dict(showgrid=False),
+            margin=dict(t=20, b=0, l=0, r=0)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
     with viz_tabs[4]:
         st.subheader("Correlation Analysis")
         
@@ -952,7 +1065,7 @@ with tabs[2]:
         st.caption("Correlation coefficients between key time and distance metrics.")
         
         corr_cols = ['actual_time', 'osrm_time', 'actual_distance_to_destination', 'osrm_distance', 'segment_actual_time', 'segment_osrm_time']
-        corr_matrix = trip_records[corr_cols].corr()
+        corr_matrix = stats_cache.corr(data_version, 'trip_records', trip_records, corr_cols)
         
         fig = px.imshow(
             corr_matrix,
@@ -969,7 +1082,7 @@ with tabs[2]:
         st.plotly_chart(fig, use_container_width=True)
 
 # TAB 4: Feature Engineering
-with tabs[3]:
+def render_feature_engineering():
     st.header("🛠️ Feature Engineering & Data Processing")
     
     st.markdown("""
@@ -1040,12 +1153,16 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
         with col1:
             st.markdown("**Before Outlier Treatment**")
             st.caption("Box plots showing the distribution with outliers present.")
-            fig = px.box(trip_records, y=['actual_time', 'osrm_time'], 
-                        labels={'variable': 'Metric', 'value': 'Time (Hours)'})
+            fig = go.Figure()
+            for col in ['actual_time', 'osrm_time']:
+                fig.add_traces(box_traces('trip_records', trip_records, col, col, '#636efa'))
             fig.update_layout(
                 plot_bgcolor='rgba(0,0,0,0)', 
                 paper_bgcolor='rgba(0,0,0,0)', 
                 font=dict(color='#cbd5e1'),
+                xaxis_title='Metric',
+                yaxis_title='Time (Hours)',
+                showlegend=False,
                 height=400
             )
             st.plotly_chart(fig, use_container_width=True)
@@ -1054,17 +1171,21 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
             st.markdown("**After Outlier Treatment**")
             st.caption("Cleaned distribution after removing extreme values.")
             # Simulating outlier removal for visualization
-            Q1 = trip_records['actual_time'].quantile(0.25)
-            Q3 = trip_records['actual_time'].quantile(0.75)
+            summary = stats_cache.box(data_version, 'trip_records', trip_records, 'actual_time')
+            Q1, Q3 = summary['q1'], summary['q3']
             IQR = Q3 - Q1
             clean_df = trip_records[~((trip_records['actual_time'] < (Q1 - 1.5 * IQR)) | (trip_records['actual_time'] > (Q3 + 1.5 * IQR)))]
             
-            fig = px.box(clean_df, y=['actual_time', 'osrm_time'],
-                        labels={'variable': 'Metric', 'value': 'Time (Hours)'})
+            fig = go.Figure()
+            for col in ['actual_time', 'osrm_time']:
+                fig.add_traces(box_traces('trip_records_iqr_clean', clean_df, col, col, '#636efa'))
             fig.update_layout(
                 plot_bgcolor='rgba(0,0,0,0)', 
                 paper_bgcolor='rgba(0,0,0,0)', 
                 font=dict(color='#cbd5e1'),
+                xaxis_title='Metric',
+                yaxis_title='Time (Hours)',
+                showlegend=False,
                 height=400
             )
             st.plotly_chart(fig, use_container_width=True)
@@ -1083,10 +1204,8 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
         </div>
         """, unsafe_allow_html=True)
         
-        scaler = StandardScaler()
         scaled_cols = ['actual_time', 'osrm_time', 'actual_distance_to_destination', 'osrm_distance']
-        scaled_data = scaler.fit_transform(trip_records[scaled_cols].dropna())
-        scaled_df = pd.DataFrame(scaled_data, columns=[f"{col}_scaled" for col in scaled_cols])
+        scaled_df = scaled_features(data_version, scaled_cols, trip_records)
         
         col1, col2 = st.columns(2)
         
@@ -1103,8 +1222,8 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
         # Visualization of scaling effect
         st.markdown("**📊 Scaling Visualization**")
         fig = go.Figure()
-        fig.add_trace(go.Box(y=trip_records['actual_time'].dropna(), name='Original', marker_color='#f472b6'))
-        fig.add_trace(go.Box(y=scaled_df['actual_time_scaled'], name='Scaled', marker_color='#38ef7d'))
+        fig.add_traces(box_traces('trip_records', trip_records, 'actual_time', 'Original', '#f472b6'))
+        fig.add_traces(box_traces('scaled_features', scaled_df, 'actual_time_scaled', 'Scaled', '#38ef7d'))
         fig.update_layout(
             plot_bgcolor='rgba(0,0,0,0)',
             paper_bgcolor='rgba(0,0,0,0)',
@@ -1151,19 +1270,19 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
         </div>
         """, unsafe_allow_html=True)
         
+        route_types = st.multiselect(
+            "Route type",
+            options=list(trip_records['route_type'].cat.categories),
+            default=list(trip_records['route_type'].cat.categories)
+        )
+        route_filter = (('route_type', route_types),)
+        
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("**⏱️ Time: Actual vs OSRM**")
-            st.caption("Scatter plot showing correlation between actual and estimated time.")
-            fig = px.scatter(
-                trip_records.sample(min(1000, len(trip_records))), 
-                x='osrm_time', 
-                y='actual_time',
-                opacity=0.5,
-                trendline="ols",
-                labels={'osrm_time': 'OSRM Estimated Time (hrs)', 'actual_time': 'Actual Time (hrs)'}
-            )
+            st.caption("Density of all trips (log scale) with the regression fit against the perfect-prediction line.")
+            fig = go.Figure(density_traces('trip_records', trip_records, 'osrm_time', 'actual_time', filter=route_filter))
             fig.add_trace(go.Scatter(
                 x=[0, trip_records['osrm_time'].max()],
                 y=[0, trip_records['osrm_time'].max()],
@@ -1172,6 +1291,9 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
                 line=dict(color='red', dash='dash')
             ))
             fig.update_layout(
+                xaxis_title='OSRM Estimated Time (hrs)',
+                yaxis_title='Actual Time (hrs)',
+                legend=dict(orientation='h', y=-0.2),
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)',
                 font=dict(color='#cbd5e1'),
@@ -1181,15 +1303,10 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
             
         with col2:
             st.markdown("**📏 Distance: Actual vs OSRM**")
-            st.caption("Scatter plot comparing actual and estimated distances.")
-            fig = px.scatter(
-                trip_records.sample(min(1000, len(trip_records))), 
-                x='osrm_distance', 
-                y='actual_distance_to_destination',
-                opacity=0.5,
-                trendline="ols",
-                labels={'osrm_distance': 'OSRM Estimated Distance (km)', 'actual_distance_to_destination': 'Actual Distance (km)'}
-            )
+            st.caption("Density of all trips (log scale) comparing actual and estimated distances.")
+            fig = go.Figure(density_traces(
+                'trip_records', trip_records, 'osrm_distance', 'actual_distance_to_destination', filter=route_filter
+            ))
             fig.add_trace(go.Scatter(
                 x=[0, trip_records['osrm_distance'].max()],
                 y=[0, trip_records['osrm_distance'].max()],
@@ -1198,6 +1315,9 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
                 line=dict(color='red', dash='dash')
             ))
             fig.update_layout(
+                xaxis_title='OSRM Estimated Distance (km)',
+                yaxis_title='Actual Distance (km)',
+                legend=dict(orientation='h', y=-0.2),
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)',
                 font=dict(color='#cbd5e1'),
@@ -1206,7 +1326,7 @@ trip_records = trip_records.merge(osrm_distance, on="trip_uuid")
             st.plotly_chart(fig, use_container_width=True)
 
 # TAB 5: Hypothesis Testing
-with tabs[4]:
+def render_hypothesis_testing():
     st.header("🔬 Hypothesis Testing")
     logger.info("Hypothesis Testing tab accessed")
     
@@ -1226,6 +1346,9 @@ with tabs[4]:
 </div>
     """, unsafe_allow_html=True)
     
+    # Every test (and the Summary tab) reads from one cached run over per-metric moments
+    tests = stats_cache.hypothesis_tests(data_version, 'trip_records', trip_records, HYPOTHESIS_TESTS)
+    
     test_tabs = st.tabs(["⏱️ Actual vs OSRM Time", "🔄 Actual vs Segment Time", "🔀 OSRM vs Segment OSRM", "📏 Actual vs OSRM Distance", "📊 Summary"])
     
     with test_tabs[0]:
@@ -1243,14 +1366,14 @@ with tabs[4]:
         st.markdown("**H0 (Null Hypothesis):** Mean Actual Time ≤ Mean OSRM Time")
         st.markdown("**Ha (Alternative Hypothesis):** Mean Actual Time > Mean OSRM Time")
         
-        t_stat, p_val = ttest_ind(trip_records['actual_time'], trip_records['osrm_time'], alternative='greater')
+        t_stat, p_val = tests.loc['Actual vs OSRM Time', ['statistic', 'pvalue']]
         
         # Metrics
         m1, m2, m3, m4 = st.columns(4)
         m1.metric("T-Statistic", f"{t_stat:.4f}", help="Measures the difference in means relative to variance")
         m2.metric("P-Value", f"{p_val:.4e}", help="Probability of observing this result by chance")
-        m3.metric("Actual Mean", f"{trip_records['actual_time'].mean():.2f}h")
-        m4.metric("OSRM Mean", f"{trip_records['osrm_time'].mean():.2f}h")
+        m3.metric("Actual Mean", f"{tests.loc['Actual vs OSRM Time', 'mean_a']:.2f}h")
+        m4.metric("OSRM Mean", f"{tests.loc['Actual vs OSRM Time', 'mean_b']:.2f}h")
         
         # Decision
         if p_val < 0.05:
@@ -1272,8 +1395,9 @@ with tabs[4]:
         with col1:
             st.markdown("**Distribution Comparison**")
             fig = go.Figure()
-            fig.add_trace(go.Histogram(x=trip_records['actual_time'], name='Actual Time', opacity=0.7, marker_color='#f472b6'))
-            fig.add_trace(go.Histogram(x=trip_records['osrm_time'], name='OSRM Time', opacity=0.7, marker_color='#38ef7d'))
+            time_range = shared_range('trip_records', trip_records, ['actual_time', 'osrm_time'])
+            fig.add_trace(histogram_bars('trip_records', trip_records, 'actual_time', 'Actual Time', '#f472b6', range=time_range))
+            fig.add_trace(histogram_bars('trip_records', trip_records, 'osrm_time', 'OSRM Time', '#38ef7d', range=time_range))
             fig.update_layout(
                 barmode='overlay', 
                 font=dict(color='#cbd5e1'), 
@@ -1288,8 +1412,8 @@ with tabs[4]:
         with col2:
             st.markdown("**Box Plot Comparison**")
             fig = go.Figure()
-            fig.add_trace(go.Box(y=trip_records['actual_time'], name='Actual Time', marker_color='#f472b6'))
-            fig.add_trace(go.Box(y=trip_records['osrm_time'], name='OSRM Time', marker_color='#38ef7d'))
+            fig.add_traces(box_traces('trip_records', trip_records, 'actual_time', 'Actual Time', '#f472b6'))
+            fig.add_traces(box_traces('trip_records', trip_records, 'osrm_time', 'OSRM Time', '#38ef7d'))
             fig.update_layout(
                 font=dict(color='#cbd5e1'),
                 paper_bgcolor='rgba(0,0,0,0)',
@@ -1314,13 +1438,13 @@ with tabs[4]:
         st.markdown("**H0:** Mean Actual Time == Mean Segment Actual Time")
         st.markdown("**Ha:** Mean Actual Time ≠ Mean Segment Actual Time")
         
-        t_stat, p_val = ttest_ind(trip_records['actual_time'], trip_records['segment_actual_time'])
+        t_stat, p_val = tests.loc['Actual vs Segment Time', ['statistic', 'pvalue']]
         
         m1, m2, m3, m4 = st.columns(4)
         m1.metric("T-Statistic", f"{t_stat:.4f}")
         m2.metric("P-Value", f"{p_val:.4e}")
-        m3.metric("Trip Mean", f"{trip_records['actual_time'].mean():.2f}h")
-        m4.metric("Segment Mean", f"{trip_records['segment_actual_time'].mean():.2f}h")
+        m3.metric("Trip Mean", f"{tests.loc['Actual vs Segment Time', 'mean_a']:.2f}h")
+        m4.metric("Segment Mean", f"{tests.loc['Actual vs Segment Time', 'mean_b']:.2f}h")
         
         if p_val < 0.05:
             st.error(f"✅ **Reject H0:** Means are significantly different (p={p_val:.4e} < 0.05)")
@@ -1330,12 +1454,13 @@ with tabs[4]:
         # Violin plot
         st.markdown("**Violin Plot Comparison**")
         fig = go.Figure()
-        fig.add_trace(go.Violin(y=trip_records['actual_time'], name='Actual Time', box_visible=True, meanline_visible=True, fillcolor='#f472b6', opacity=0.6))
-        fig.add_trace(go.Violin(y=trip_records['segment_actual_time'], name='Segment Time', box_visible=True, meanline_visible=True, fillcolor='#667eea', opacity=0.6))
+        fig.add_traces(violin_traces('trip_records', trip_records, 'actual_time', 'Actual Time', '#f472b6', 0))
+        fig.add_traces(violin_traces('trip_records', trip_records, 'segment_actual_time', 'Segment Time', '#667eea', 1))
         fig.update_layout(
             font=dict(color='#cbd5e1'),
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)',
+            xaxis=dict(tickvals=[0, 1], ticktext=['Actual Time', 'Segment Time'], showgrid=False),
             yaxis_title='Time (hours)',
             height=400
         )
@@ -1355,13 +1480,13 @@ with tabs[4]:
         st.markdown("**H0:** Mean OSRM Time ≥ Mean Segment OSRM Time")
         st.markdown("**Ha:** Mean OSRM Time < Mean Segment OSRM Time")
         
-        t_stat, p_val = ttest_ind(trip_records['osrm_time'], trip_records['segment_osrm_time'], alternative='less')
+        t_stat, p_val = tests.loc['OSRM vs Segment OSRM', ['statistic', 'pvalue']]
         
         m1, m2, m3, m4 = st.columns(4)
         m1.metric("T-Statistic", f"{t_stat:.4f}")
         m2.metric("P-Value", f"{p_val:.4e}")
-        m3.metric("OSRM Mean", f"{trip_records['osrm_time'].mean():.2f}h")
-        m4.metric("Segment OSRM", f"{trip_records['segment_osrm_time'].mean():.2f}h")
+        m3.metric("OSRM Mean", f"{tests.loc['OSRM vs Segment OSRM', 'mean_a']:.2f}h")
+        m4.metric("Segment OSRM", f"{tests.loc['OSRM vs Segment OSRM', 'mean_b']:.2f}h")
         
         if p_val < 0.05:
             st.error(f"✅ **Reject H0:** OSRM Time is significantly less (p={p_val:.4e} < 0.05)")
@@ -1370,15 +1495,11 @@ with tabs[4]:
         
         # Scatter plot
         st.markdown("**Correlation Scatter Plot**")
-        fig = px.scatter(
-            trip_records.sample(min(1000, len(trip_records))),
-            x='segment_osrm_time',
-            y='osrm_time',
-            opacity=0.5,
-            trendline='ols',
-            labels={'segment_osrm_time': 'Segment OSRM Time (h)', 'osrm_time': 'OSRM Time (h)'}
-        )
+        fig = go.Figure(density_traces('trip_records', trip_records, 'segment_osrm_time', 'osrm_time'))
         fig.update_layout(
+            xaxis_title='Segment OSRM Time (h)',
+            yaxis_title='OSRM Time (h)',
+            legend=dict(orientation='h', y=-0.2),
             font=dict(color='#cbd5e1'),
             paper_bgcolor='rgba(0,0,0,0)',
             plot_bgcolor='rgba(0,0,0,0)',
@@ -1400,13 +1521,13 @@ with tabs[4]:
         st.markdown("**H0:** Mean Actual Distance == Mean OSRM Distance")
         st.markdown("**Ha:** Mean Actual Distance ≠ Mean OSRM Distance")
         
-        t_stat, p_val = ttest_ind(trip_records['actual_distance_to_destination'], trip_records['osrm_distance'])
+        t_stat, p_val = tests.loc['Actual vs OSRM Distance', ['statistic', 'pvalue']]
         
         m1, m2, m3, m4 = st.columns(4)
         m1.metric("T-Statistic", f"{t_stat:.4f}")
         m2.metric("P-Value", f"{p_val:.4e}")
-        m3.metric("Actual Mean", f"{trip_records['actual_distance_to_destination'].mean():.1f}km")
-        m4.metric("OSRM Mean", f"{trip_records['osrm_distance'].mean():.1f}km")
+        m3.metric("Actual Mean", f"{tests.loc['Actual vs OSRM Distance', 'mean_a']:.1f}km")
+        m4.metric("OSRM Mean", f"{tests.loc['Actual vs OSRM Distance', 'mean_b']:.1f}km")
         
         if p_val < 0.05:
             st.error(f"✅ **Reject H0:** Distances are significantly different (p={p_val:.4e} < 0.05)")
@@ -1426,8 +1547,9 @@ with tabs[4]:
         with col1:
             st.markdown("**Distribution Comparison**")
             fig = go.Figure()
-            fig.add_trace(go.Histogram(x=trip_records['actual_distance_to_destination'], name='Actual Distance', opacity=0.7, marker_color='#fb923c'))
-            fig.add_trace(go.Histogram(x=trip_records['osrm_distance'], name='OSRM Distance', opacity=0.7, marker_color='#667eea'))
+            distance_range = shared_range('trip_records', trip_records, ['actual_distance_to_destination', 'osrm_distance'])
+            fig.add_trace(histogram_bars('trip_records', trip_records, 'actual_distance_to_destination', 'Actual Distance', '#fb923c', range=distance_range))
+            fig.add_trace(histogram_bars('trip_records', trip_records, 'osrm_distance', 'OSRM Distance', '#667eea', range=distance_range))
             fig.update_layout(
                 barmode='overlay',
                 font=dict(color='#cbd5e1'),
@@ -1442,8 +1564,8 @@ with tabs[4]:
         with col2:
             st.markdown("**Box Plot Comparison**")
             fig = go.Figure()
-            fig.add_trace(go.Box(y=trip_records['actual_distance_to_destination'], name='Actual', marker_color='#fb923c'))
-            fig.add_trace(go.Box(y=trip_records['osrm_distance'], name='OSRM', marker_color='#667eea'))
+            fig.add_traces(box_traces('trip_records', trip_records, 'actual_distance_to_destination', 'Actual', '#fb923c'))
+            fig.add_traces(box_traces('trip_records', trip_records, 'osrm_distance', 'OSRM', '#667eea'))
             fig.update_layout(
                 font=dict(color='#cbd5e1'),
                 paper_bgcolor='rgba(0,0,0,0)',
@@ -1464,11 +1586,11 @@ with tabs[4]:
         </div>
         """, unsafe_allow_html=True)
         
-        # Run all tests
-        test1_t, test1_p = ttest_ind(trip_records['actual_time'], trip_records['osrm_time'], alternative='greater')
-        test2_t, test2_p = ttest_ind(trip_records['actual_time'], trip_records['segment_actual_time'])
-        test3_t, test3_p = ttest_ind(trip_records['osrm_time'], trip_records['segment_osrm_time'], alternative='less')
-        test4_t, test4_p = ttest_ind(trip_records['actual_distance_to_destination'], trip_records['osrm_distance'])
+        # Results of all tests
+        test1_t, test1_p = tests.loc['Actual vs OSRM Time', ['statistic', 'pvalue']]
+        test2_t, test2_p = tests.loc['Actual vs Segment Time', ['statistic', 'pvalue']]
+        test3_t, test3_p = tests.loc['OSRM vs Segment OSRM', ['statistic', 'pvalue']]
+        test4_t, test4_p = tests.loc['Actual vs OSRM Distance', ['statistic', 'pvalue']]
         
         summary_data = pd.DataFrame({
             'Test': [
@@ -1517,7 +1639,7 @@ with tabs[4]:
             st.success("All metrics show no significant differences - OSRM estimates are accurate!")
 
 # TAB 6: Insights
-with tabs[5]:
+def render_insights():
     st.header("💡 Insights & Recommendations")
     
     # Key Metrics Overview
@@ -1536,10 +1658,14 @@ with tabs[5]:
     """, unsafe_allow_html=True)
     
     # Calculate key metrics
-    avg_time_diff = (trip_records['actual_time'].mean() - trip_records['osrm_time'].mean())
-    avg_dist_diff = (trip_records['osrm_distance'].mean() - trip_records['actual_distance_to_destination'].mean())
-    route_dist = trip_records['route_type'].value_counts()
-    top_states = df['source_state'].value_counts().head(3)
+    means = stats_cache.moments(
+        data_version, 'trip_records', trip_records,
+        ['actual_time', 'osrm_time', 'osrm_distance', 'actual_distance_to_destination']
+    )['mean']
+    avg_time_diff = (means['actual_time'] - means['osrm_time'])
+    avg_dist_diff = (means['osrm_distance'] - means['actual_distance_to_destination'])
+    route_dist = stats_cache.value_counts(data_version, 'trip_records', trip_records, 'route_type')
+    top_states = state_trips('source_state', 3)
     
     # Metrics Cards
     m1, m2, m3, m4 = st.columns(4)
@@ -1579,7 +1705,7 @@ with tabs[5]:
         st.markdown(f"""
         <div class='metric-card' style='text-align: center; border-left: 4px solid #fb923c;'>
             <div style='font-size: 2rem; color: #fb923c;'>🗺️</div>
-            <div style='font-size: 1.8rem; font-weight: bold; color: #cbd5e1;'>{top_states.iloc[0]}</div>
+            <div style='font-size: 1.8rem; font-weight: bold; color: #cbd5e1;'>{top_states.index[0]}</div>
             <div style='color: #94a3b8; font-size: 0.9rem;'>Top State</div>
             <div style='color: #fb923c; font-size: 0.8rem; margin-top: 0.5rem;'>{top_states.iloc[0]:,} trips</div>
         </div>
@@ -1816,7 +1942,7 @@ with tabs[5]:
             """, unsafe_allow_html=True)
 
 # TAB 7: Complete Analysis
-with tabs[6]:
+def render_complete_analysis():
     st.header("📚 Complete Analysis & Advanced Analytics")
     
     st.markdown("""
@@ -1838,7 +1964,7 @@ with tabs[6]:
     valid_cols = [col for col in numeric_cols if col in trip_records.columns]
     
     if valid_cols:
-        corr_matrix = trip_records[valid_cols].corr()
+        corr_matrix = stats_cache.corr(data_version, 'trip_records', trip_records, valid_cols)
         
         col1, col2 = st.columns([2, 1])
         
@@ -1880,7 +2006,7 @@ with tabs[6]:
     # Detailed Statistics
     st.subheader("📋 Detailed Statistical Summary")
     with st.expander("View Full Statistics Table", expanded=True):
-        st.dataframe(trip_records.describe().T, use_container_width=True)
+        st.dataframe(stats_cache.describe(data_version, 'trip_records', trip_records).T, use_container_width=True)
 
     st.markdown("---")
     
@@ -1900,24 +2026,19 @@ with tabs[6]:
     
     with dist_tabs[0]:
         time_cols = ['actual_time', 'osrm_time', 'segment_actual_time', 'segment_osrm_time']
-        # Melt for boxplot
-        time_melt = trip_records[time_cols].melt(var_name='Metric', value_name='Time (Hours)')
-        
-        fig = px.box(time_melt, x='Metric', y='Time (Hours)', 
-                     color='Metric', 
-                     title="Distribution of Time Metrics",
-                     color_discrete_sequence=px.colors.qualitative.Pastel)
+        fig = go.Figure()
+        for col, color in zip(time_cols, px.colors.qualitative.Pastel):
+            fig.add_traces(box_traces('trip_records', trip_records, col, col, color))
+        fig.update_layout(title="Distribution of Time Metrics", xaxis_title='Metric', yaxis_title='Time (Hours)', legend_title_text='Metric')
         fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font=dict(color='#cbd5e1'))
         st.plotly_chart(fig, use_container_width=True)
         
     with dist_tabs[1]:
         dist_cols = ['actual_distance_to_destination', 'osrm_distance', 'segment_osrm_distance']
-        dist_melt = trip_records[dist_cols].melt(var_name='Metric', value_name='Distance (km)')
-        
-        fig = px.box(dist_melt, x='Metric', y='Distance (km)', 
-                     color='Metric', 
-                     title="Distribution of Distance Metrics",
-                     color_discrete_sequence=px.colors.qualitative.Bold)
+        fig = go.Figure()
+        for col, color in zip(dist_cols, px.colors.qualitative.Bold):
+            fig.add_traces(box_traces('trip_records', trip_records, col, col, color))
+        fig.update_layout(title="Distribution of Distance Metrics", xaxis_title='Metric', yaxis_title='Distance (km)', legend_title_text='Metric')
         fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font=dict(color='#cbd5e1'))
         st.plotly_chart(fig, use_container_width=True)
         
@@ -1926,23 +2047,22 @@ with tabs[6]:
         
         # Calculate Z-scores
         numeric_cols_z = ['actual_time', 'osrm_time', 'actual_distance_to_destination', 'osrm_distance']
-        z_scores = stats.zscore(trip_records[numeric_cols_z].dropna())
-        abs_z_scores = np.abs(z_scores)
-        filtered_entries = (abs_z_scores < 3).all(axis=1)
-        trip_records_clean = trip_records.dropna().iloc[filtered_entries]
+        trip_records_clean = zscore_inliers(data_version, numeric_cols_z, trip_records)
         
         st.info(f"Original Records: {len(trip_records)} | Cleaned Records (Z-Score < 3): {len(trip_records_clean)}")
         
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("**Before Cleaning**")
-            fig = px.histogram(trip_records, x='actual_time', nbins=50, title="Actual Time Distribution (Raw)")
+            fig = go.Figure(histogram_bars('trip_records', trip_records, 'actual_time', 'actual_time', '#636efa', opacity=1))
+            fig.update_layout(title="Actual Time Distribution (Raw)", xaxis_title='actual_time', yaxis_title='count', bargap=0)
             fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font=dict(color='#cbd5e1'))
             st.plotly_chart(fig, use_container_width=True)
             
         with col2:
             st.markdown("**After Cleaning**")
-            fig = px.histogram(trip_records_clean, x='actual_time', nbins=50, title="Actual Time Distribution (Cleaned)")
+            fig = go.Figure(histogram_bars('trip_records_clean', trip_records_clean, 'actual_time', 'actual_time', '#636efa', opacity=1))
+            fig.update_layout(title="Actual Time Distribution (Cleaned)", xaxis_title='actual_time', yaxis_title='count', bargap=0)
             fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font=dict(color='#cbd5e1'))
             st.plotly_chart(fig, use_container_width=True)
 
@@ -1967,7 +2087,7 @@ with tabs[6]:
         st.markdown("**📊 Statistical Report**")
         st.download_button(
             label="Download Statistics (CSV)",
-            data=trip_records.describe().to_csv().encode('utf-8'),
+            data=stats_cache.describe(data_version, 'trip_records', trip_records).to_csv().encode('utf-8'),
             file_name="delhivery_statistics.csv",
             mime="text/csv",
             key='download-stats'
@@ -1985,7 +2105,7 @@ with tabs[6]:
             )
 
 # TAB 8: Logs
-with tabs[7]:
+def render_logs():
     st.header("📝 Application Logs")
     
     st.markdown("""
@@ -2063,6 +2183,9 @@ with tabs[7]:
             </div>
             """, unsafe_allow_html=True)
         
+        cache = stats_cache.cache_info()
+        st.caption(f"Statistics cache: {cache.hits} hits, {cache.misses} misses, {cache.currsize}/{cache.maxsize} entries")
+        
         st.markdown("<br>", unsafe_allow_html=True)
         
         # Filters
@@ -2188,3 +2311,20 @@ with tabs[7]:
             </p>
         </div>
         """, unsafe_allow_html=True)
+
+
+# Main Tabs: only the selected tab's section runs on each rerun
+TABS = {
+    "📊 Problem Statement": render_problem_statement,
+    "📝 Methodology": render_methodology,
+    "🔍 Interactive EDA": render_eda,
+    "🛠️ Feature Engineering": render_feature_engineering,
+    "🔬 Hypothesis Testing": render_hypothesis_testing,
+    "💡 Insights & Recommendations": render_insights,
+    "📚 Complete Analysis": render_complete_analysis,
+    "📝 Logs": render_logs,
+}
+
+active_tab = st.radio("Section", list(TABS), horizontal=True, label_visibility="collapsed", key="active_tab")
+logger.info(f"Rendering tab: {active_tab}")
+TABS[active_tab]()
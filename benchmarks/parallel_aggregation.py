@@ -0,0 +1,53 @@
+"""
+Benchmark: trip aggregation across worker processes.
+
+Times ``aggregate_trips_parallel`` for each worker count, checks that every
+run matches the single-process ``aggregate_trips`` result, and reports the
+speedup. ``copies`` tiles the dataset (with distinct trip ids per copy) to
+approximate multi-million-row exports.
+
+Usage (from the repository root):
+    python benchmarks/parallel_aggregation.py [delhivery_data.csv] [workers,...] [copies]
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from delhivery import add_features, aggregate_trips, aggregate_trips_parallel, load_segments
+
+
+def tile(data, copies):
+    frames = [data.assign(trip_uuid=data["trip_uuid"].astype(str) + f"-{i}") for i in range(copies)]
+    tiled = pd.concat(frames, ignore_index=True)
+    return tiled.astype({"trip_uuid": "category", "route_type": "category"})
+
+
+def main():
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "delhivery_data.csv"
+    worker_counts = [int(w) for w in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1, 2, 4, os.cpu_count()]
+    copies = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    data = add_features(load_segments("dashboard", csv_path=csv_path))
+    if copies > 1:
+        data = tile(data, copies)
+    print(f"Segments: {len(data):,}  Trips: {data['trip_uuid'].nunique():,}  CPUs: {os.cpu_count()}")
+
+    start = time.perf_counter()
+    expected = aggregate_trips(data)
+    baseline = time.perf_counter() - start
+    print(f"in-process   : {baseline * 1000:9.1f} ms")
+
+    for workers in sorted(set(worker_counts)):
+        start = time.perf_counter()
+        result = aggregate_trips_parallel(data, workers)
+        elapsed = time.perf_counter() - start
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"{workers:3d} workers  : {elapsed * 1000:9.1f} ms  speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
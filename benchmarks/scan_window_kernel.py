@@ -0,0 +1,58 @@
+"""
+Benchmark: two-level "max per scan window, sum per trip" reduction.
+
+Compares the four chained pandas groupbys the dashboard used to run (one per
+cumulative field) with the single-sort multi-column kernel in
+``delhivery.aggregation``, and checks that both give the same numbers.
+
+Usage (from the repository root):
+    python benchmarks/scan_window_kernel.py [delhivery_data.csv] [repeats]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from delhivery import add_features, load_segments, scan_window_totals
+from delhivery.aggregation import WINDOW_MAX_COLUMNS
+
+
+def groupby_path(data):
+    results = {}
+    for col in WINDOW_MAX_COLUMNS:
+        results[col] = data.groupby(["trip_uuid", "start_scan_to_end_scan"], observed=True)[col].max().reset_index().groupby("trip_uuid", observed=True)[col].sum()
+    return results
+
+
+def best_of(func, data, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "delhivery_data.csv"
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    data = add_features(load_segments("dashboard", csv_path=csv_path))
+    print(f"Segments: {len(data):,}  Trips: {data['trip_uuid'].nunique():,}")
+
+    old_time, old = best_of(groupby_path, data, repeats)
+    new_time, new = best_of(scan_window_totals, data, repeats)
+
+    for col in WINDOW_MAX_COLUMNS:
+        assert np.array_equal(old[col].to_numpy(), new[col].to_numpy(), equal_nan=True), col
+
+    print(f"4 x chained groupby : {old_time * 1000:8.1f} ms")
+    print(f"multi-column kernel : {new_time * 1000:8.1f} ms")
+    print(f"speedup             : {old_time / new_time:8.1f}x  (results identical)")
+
+
+if __name__ == "__main__":
+    main()
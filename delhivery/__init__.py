@@ -0,0 +1,81 @@
+"""
+Shared data pipeline for the Delhivery dashboard and EDA scripts.
+"""
+
+from delhivery.schema import (
+    COLUMNS,
+    CONSUMER_COLUMNS,
+    DATETIME_COLUMNS,
+    DTYPES,
+    columns_for,
+)
+from delhivery.timestamps import TIMESTAMP_FORMAT, decode_timestamps, parse_timestamps
+from delhivery.snapshot import (
+    CSV_PATH,
+    SNAPSHOT_PATH,
+    iter_segments,
+    load_segments,
+    read_csv,
+    read_snapshot,
+    write_snapshot,
+)
+from delhivery.normalization import ALIASES_PATH, aliases_version, canonical_places, load_aliases
+from delhivery.features import (
+    CENTER_FIELDS,
+    PLACE_FIELDS,
+    add_features,
+    parse_place_names,
+    split_center_codes,
+    split_place_names,
+)
+from delhivery.aggregation import (
+    AGGREGATION_WORKERS,
+    TRIP_COLUMNS,
+    TripAccumulator,
+    aggregate_trips,
+    aggregate_trips_parallel,
+    first_distinct,
+    group_sum,
+    scan_window_totals,
+    stream_trip_records,
+    window_max_sum,
+)
+from delhivery.buckets import DISTANCE_EDGES, DISTANCE_LABELS, bucketize
+from delhivery.corridors import CORRIDOR_KEYS, CORRIDOR_METRICS, corridor_cube, slice_corridors
+from delhivery.codes import category_codes
+from delhivery.distinct import DISTINCT_PRECISION, distinct_counts
+from delhivery.routes import LOCATION_COLUMNS, StopLists, build_route_records, ordered_distinct, trip_locations
+from delhivery.compact import compact_trip_records, memory_report
+from delhivery.artifacts import (
+    ARTIFACT_DIR,
+    artifact_path,
+    build_trip_tables,
+    dataset_version,
+    load_trip_tables,
+    pipeline_version,
+    source_hash,
+)
+from delhivery.incremental import (
+    STORE_DIR,
+    append_segments,
+    combined_segments,
+    load_store,
+    new_store,
+    rebuild_store,
+    store_mtime,
+    store_path,
+    store_version,
+)
+from delhivery.density import DENSITY_BINS, density_grid
+from delhivery.distributions import BOX_OUTLIERS, box_summary, kde_curve
+from delhivery.histograms import HISTOGRAM_BINS, histogram
+from delhivery.hypothesis import HYPOTHESIS_TESTS, HypothesisTest, metric_moments, run_tests
+from delhivery.regression import (
+    CONFIDENCE_LEVEL,
+    MOMENT_COLUMNS,
+    REGRESSION_PAIRS,
+    confidence_band,
+    ols_fit,
+    regression_moments,
+)
+from delhivery.stats import STATS_CACHE_SIZE, StatisticsCache
@@ -0,0 +1,284 @@
+"""
+Trip-level aggregation of the segment table.
+
+``aggregate_trips`` builds ``trip_records`` from a fully loaded segment frame.
+``TripAccumulator`` produces the same table from a stream of chunks: each chunk
+is reduced to per-trip partials (scan-window maxima, segment sums, distinct
+OD durations, first route type) that are folded into a running state, so
+memory grows with the number of trips rather than the number of segments.
+
+Usage:
+    python -m delhivery.aggregation <segments.csv> <trip_records.csv> [chunksize]
+"""
+
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from delhivery.codes import category_codes
+from delhivery.features import add_features
+from delhivery.snapshot import CSV_PATH, SNAPSHOT_PATH, iter_segments
+
+# Cumulative fields: max within each start_scan_to_end_scan window, summed per trip
+WINDOW_MAX_COLUMNS = ["actual_time", "osrm_time", "osrm_distance", "actual_distance_to_destination"]
+
+# Per-segment fields: summed per trip
+SEGMENT_SUM_COLUMNS = ["segment_osrm_time", "segment_actual_time", "segment_osrm_distance"]
+
+TRIP_COLUMNS = [
+    "trip_uuid", "segment_osrm_time", "osrm_time", "segment_actual_time", "actual_time",
+    "time_taken_btwn_odstart_and_od_end", "start_scan_to_end_scan",
+    "segment_osrm_distance", "actual_distance_to_destination", "osrm_distance", "route_type",
+]
+
+WINDOW_KEYS = ["trip_uuid", "start_scan_to_end_scan"]
+
+# Worker processes used when building trip_records (1 = in-process)
+AGGREGATION_WORKERS = int(os.environ.get("DELHIVERY_AGGREGATION_WORKERS", "1"))
+
+
+def group_sum(codes, values, n_groups, compensated=True):
+    """Sum ``values`` per group code, visiting each group's values in row order.
+
+    ``values`` is 1-D or (rows, columns). With ``compensated`` this reproduces
+    pandas' Kahan-compensated groupby sum (NaN skipped); without it, Python's
+    left-to-right ``sum`` (NaN propagates). Groups are processed in lock-step:
+    step ``k`` adds the k-th value of every group at once, so the loop runs
+    once per row of the longest group.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    flat = values.ndim == 1
+    if flat:
+        values = values[:, None]
+    total = np.zeros((n_groups, values.shape[1]))
+    if len(codes) == 0:
+        return total[:, 0] if flat else total
+
+    order = np.argsort(codes, kind="stable")
+    codes, values = codes[order], values[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    rank = np.arange(len(codes)) - np.repeat(starts, np.diff(np.r_[starts, len(codes)]))
+    by_rank = np.argsort(rank, kind="stable")
+    bounds = np.searchsorted(rank[by_rank], np.arange(rank.max() + 2))
+
+    compensation = np.zeros_like(total)
+    for k in range(len(bounds) - 1):
+        rows = by_rank[bounds[k]:bounds[k + 1]]
+        group, value = codes[rows], values[rows]
+        if compensated:
+            running, carry = total[group], compensation[group]
+            skip = np.isnan(value)
+            y = value - carry
+            t = running + y
+            c = (t - running) - y
+            compensation[group] = np.where(skip, carry, np.where(np.isnan(c), 0.0, c))
+            total[group] = np.where(skip, running, t)
+        else:
+            total[group] += value
+    return total[:, 0] if flat else total
+
+
+def scan_windows(codes, scan):
+    """Group rows into (trip code, start_scan_to_end_scan) windows with one sort.
+
+    Returns the row order (rows with a missing code or scan value dropped), the
+    offset in that order where each window starts, and each window's trip code.
+    Windows come out sorted by trip code, then scan value.
+    """
+    scan_codes, scan_values = pd.factorize(scan, sort=True)
+    valid = np.flatnonzero((codes >= 0) & (scan_codes >= 0))
+    if len(valid) == 0:
+        return valid, valid, valid
+    # Integer (trip, scan) key; a stable sort keeps row order inside each window
+    key = codes[valid].astype(np.int64) * len(scan_values) + scan_codes[valid]
+    by_key = np.argsort(key, kind="stable")
+    order, key = valid[by_key], key[by_key]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    return order, starts, codes[order[starts]]
+
+
+def window_max_sum(codes, scan, values, n_groups):
+    """Max of every column of ``values`` within each scan window, summed per trip code.
+
+    This is ``groupby([trip, scan])[cols].max().groupby(trip).sum()`` for all
+    columns together, from a single sort. Returns the (n_groups, columns)
+    totals and the number of windows per trip code.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    order, starts, window_trip = scan_windows(codes, scan)
+    windows_per_trip = np.bincount(window_trip, minlength=n_groups)
+    if len(order) == 0:
+        return np.zeros((n_groups, values.shape[1])), windows_per_trip
+    maxima = np.column_stack([np.fmax.reduceat(column[order], starts) for column in values.T])
+    return group_sum(window_trip, maxima, n_groups), windows_per_trip
+
+
+def scan_window_totals(data, columns=WINDOW_MAX_COLUMNS):
+    """Per-trip sum of per-window maxima for ``columns`` of a segment frame.
+
+    Returns one row per trip that has at least one scan window, with
+    ``trip_uuid`` followed by ``columns``.
+    """
+    codes, trips = pd.factorize(data["trip_uuid"], sort=True)
+    scan = data["start_scan_to_end_scan"].to_numpy(dtype=np.float64)
+    totals, windows_per_trip = window_max_sum(codes, scan, data[columns].to_numpy(dtype=np.float64), len(trips))
+
+    result = pd.DataFrame(totals, columns=columns)
+    result.insert(0, "trip_uuid", trips)
+    return result[windows_per_trip > 0].reset_index(drop=True)
+
+
+def first_distinct(codes, values):
+    """Mask of rows holding the first occurrence of each (code, value) pair."""
+    if len(codes) == 0:
+        return np.zeros(0, dtype=bool)
+    order = np.lexsort((values, codes))
+    sorted_codes, sorted_values = codes[order], values[order]
+    same = (sorted_codes[1:] == sorted_codes[:-1]) & (
+        (sorted_values[1:] == sorted_values[:-1]) | (np.isnan(sorted_values[1:]) & np.isnan(sorted_values[:-1]))
+    )
+    # lexsort is stable, so the first row of each run is the earliest occurrence
+    first = np.zeros(len(codes), dtype=bool)
+    first[order[np.r_[True, ~same]]] = True
+    return first
+
+
+def aggregate_trips(data):
+    """Aggregate a featurized segment frame into one row per trip.
+
+    ``trip_uuid`` is factorized once and every metric is a reduction over the
+    trip codes, giving exactly the values of the original groupby/merge chain:
+    per-window maxima summed per trip for the cumulative fields, sums for the
+    segment fields, sums of distinct values for the OD duration and scan time,
+    and the first route_type of each trip.
+    """
+    codes, trips = pd.factorize(data["trip_uuid"], sort=True)
+    scan = data["start_scan_to_end_scan"].to_numpy(dtype=np.float64)
+    n_trips = len(trips)
+
+    window_totals, windows_per_trip = window_max_sum(
+        codes, scan, data[WINDOW_MAX_COLUMNS].to_numpy(dtype=np.float64), n_trips
+    )
+
+    # Trips without a single scan window drop out of the original inner merges
+    has_window = windows_per_trip > 0
+    rows = codes >= 0
+    rows[rows] = has_window[codes[rows]]
+    row_codes = codes[rows]
+
+    columns = {"trip_uuid": trips}
+    segment_totals = group_sum(row_codes, data[SEGMENT_SUM_COLUMNS].to_numpy(dtype=np.float64)[rows], n_trips)
+    for i, col in enumerate(SEGMENT_SUM_COLUMNS):
+        columns[col] = segment_totals[:, i]
+    for i, col in enumerate(WINDOW_MAX_COLUMNS):
+        columns[col] = window_totals[:, i]
+    for col in ["time_taken_btwn_odstart_and_od_end", "start_scan_to_end_scan"]:
+        values = data[col].to_numpy(dtype=np.float64)[rows]
+        first = first_distinct(row_codes, values)
+        columns[col] = group_sum(row_codes[first], values[first], n_trips, compensated=False)
+
+    # np.unique returns the first position of each trip code among kept rows
+    first = np.unique(row_codes, return_index=True)[1]
+    route_type = np.empty(n_trips, dtype=object)
+    route_type[row_codes[first]] = data["route_type"].to_numpy()[np.flatnonzero(rows)[first]]
+    columns["route_type"] = route_type
+
+    trip_records = pd.DataFrame(columns)[TRIP_COLUMNS]
+    return trip_records[has_window].reset_index(drop=True)
+
+
+def _partition_codes(trip_uuid, partitions):
+    # Stable hash of each distinct trip id, broadcast back through its code
+    codes, uniques = category_codes(trip_uuid)
+    buckets = pd.util.hash_array(np.asarray(uniques, dtype=object)) % partitions
+    return np.where(codes >= 0, buckets[codes], -1)
+
+
+def aggregate_trips_parallel(data, workers=None):
+    """``aggregate_trips`` over ``workers`` processes.
+
+    Segments are partitioned by a hash of ``trip_uuid``, so every trip lives
+    in exactly one partition and the per-partition results only need to be
+    concatenated. Each trip sees its rows in the original order, so the values
+    are identical to the single-process result.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return aggregate_trips(data)
+    columns = list(dict.fromkeys(
+        WINDOW_KEYS + WINDOW_MAX_COLUMNS + SEGMENT_SUM_COLUMNS + ["time_taken_btwn_odstart_and_od_end", "route_type"]
+    ))
+    data = data[columns]
+    partition = _partition_codes(data["trip_uuid"], workers)
+    parts = [data[partition == i] for i in range(workers)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(aggregate_trips, parts))
+    trip_records = pd.concat(results, ignore_index=True)
+    return trip_records.sort_values("trip_uuid", kind="stable").reset_index(drop=True)
+
+
+class TripAccumulator:
+    """Running per-trip partial aggregates folded chunk by chunk."""
+
+    def __init__(self):
+        self.windows = None     # (trip_uuid, start_scan_to_end_scan) -> max of cumulative fields
+        self.sums = None        # trip_uuid -> sum of segment fields
+        self.od_times = None    # distinct (trip_uuid, time_taken) pairs in arrival order
+        self.route_type = None  # trip_uuid -> first route_type seen
+        self.rows = 0
+
+    def add(self, chunk):
+        """Fold one featurized chunk into the running state."""
+        chunk = chunk.assign(trip_uuid=chunk["trip_uuid"].astype(object), route_type=chunk["route_type"].astype(object))
+        self.rows += len(chunk)
+
+        windows = chunk.groupby(WINDOW_KEYS, sort=False)[WINDOW_MAX_COLUMNS].max()
+        sums = chunk.groupby("trip_uuid", sort=False)[SEGMENT_SUM_COLUMNS].sum()
+        od_times = chunk[["trip_uuid", "time_taken_btwn_odstart_and_od_end"]].drop_duplicates()
+        route_type = chunk.groupby("trip_uuid", sort=False)["route_type"].first()
+
+        if self.windows is None:
+            self.windows, self.sums, self.od_times, self.route_type = windows, sums, od_times, route_type
+            return self
+
+        # Trips spanning a chunk boundary are merged with the same max/sum semantics
+        self.windows = pd.concat([self.windows, windows]).groupby(level=WINDOW_KEYS, sort=False).max()
+        self.sums = pd.concat([self.sums, sums]).groupby(level="trip_uuid", sort=False).sum()
+        self.od_times = pd.concat([self.od_times, od_times], ignore_index=True).drop_duplicates()
+        self.route_type = pd.concat([self.route_type, route_type]).groupby(level="trip_uuid", sort=False).first()
+        return self
+
+    def result(self, trip_uuids=None):
+        """Finalize the partials into ``trip_records``, optionally only for ``trip_uuids``."""
+        windows = self.windows.reset_index()
+        od_times = self.od_times
+        if trip_uuids is not None:
+            windows = windows[windows["trip_uuid"].isin(trip_uuids)]
+            od_times = od_times[od_times["trip_uuid"].isin(trip_uuids)]
+        per_window = windows.groupby("trip_uuid")[WINDOW_MAX_COLUMNS + ["start_scan_to_end_scan"]].sum()
+        time_taken = od_times.groupby("trip_uuid")["time_taken_btwn_odstart_and_od_end"].sum()
+
+        trip_records = per_window.join(self.sums).join(time_taken).join(self.route_type)
+        return trip_records.sort_index().reset_index()[TRIP_COLUMNS]
+
+
+def stream_trip_records(consumer="dashboard", chunksize=500_000, csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Build ``trip_records`` from bounded chunks without holding all segments."""
+    accumulator = TripAccumulator()
+    for chunk in iter_segments(consumer, chunksize, csv_path, snapshot_path):
+        accumulator.add(add_features(chunk))
+    return accumulator.result()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    csv_path, out_path = sys.argv[1], sys.argv[2]
+    chunksize = int(sys.argv[3]) if len(sys.argv) > 3 else 500_000
+    # Stream straight from the export; a snapshot only exists for the default dataset
+    trip_records = stream_trip_records(chunksize=chunksize, csv_path=csv_path, snapshot_path=csv_path + ".parquet")
+    trip_records.to_csv(out_path, index=False)
@@ -0,0 +1,129 @@
+"""
+On-disk cache of the featurized segment frame and ``trip_records``.
+
+``st.cache_data`` only lives inside one Streamlit process, so every replica
+and redeploy used to rebuild the aggregation. ``load_trip_tables`` stores the
+result under ``ARTIFACT_DIR`` keyed by a content hash of the source data plus
+the pipeline version (a digest of the ``delhivery`` code and data files), and
+rebuilds it only when either changes.
+
+Usage:
+    python -m delhivery.artifacts [consumer] [workers]
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import sys
+
+import pandas as pd
+
+from delhivery.aggregation import AGGREGATION_WORKERS, aggregate_trips_parallel
+from delhivery.features import add_features
+from delhivery.snapshot import CSV_PATH, SNAPSHOT_PATH, load_segments
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = ".delhivery_cache"
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _digest(paths):
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def pipeline_version():
+    """Digest of the pipeline code and data files; changes whenever either does."""
+    paths = sorted(glob.glob(os.path.join(PACKAGE_DIR, "*.py")) + glob.glob(os.path.join(PACKAGE_DIR, "data", "*")))
+    return _digest(paths)
+
+
+def source_hash(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Content hash of the raw CSV, or of the snapshot when only that exists."""
+    return _digest([csv_path if os.path.exists(csv_path) else snapshot_path])
+
+
+def dataset_version(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Key of the current source content and pipeline version."""
+    return hashlib.blake2b(
+        f"{source_hash(csv_path, snapshot_path)}:{pipeline_version()}".encode(), digest_size=16
+    ).hexdigest()
+
+
+def artifact_path(
+    consumer="dashboard", csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH, artifact_dir=ARTIFACT_DIR, version=None,
+):
+    """Artifact file for ``consumer`` at ``version`` (default: the current ``dataset_version``)."""
+    version = dataset_version(csv_path, snapshot_path) if version is None else version
+    return os.path.join(artifact_dir, f"trip_tables-{consumer}-{version}.pkl")
+
+
+def build_trip_tables(consumer="dashboard", csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH, workers=AGGREGATION_WORKERS):
+    """Load, featurize and aggregate the segments: ``(df, trip_records)``."""
+    df = add_features(load_segments(consumer, csv_path, snapshot_path))
+    return df, aggregate_trips_parallel(df, workers)
+
+
+def write_pickle(obj, path):
+    """Pickle ``obj`` to ``path`` via a temp file and rename, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pd.to_pickle(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write(path, tables):
+    write_pickle(tables, path)
+    # Drop artifacts of the same consumer built from older data or code
+    prefix = os.path.basename(path).rsplit("-", 1)[0]
+    for stale in glob.glob(os.path.join(os.path.dirname(path), f"{prefix}-*.pkl")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def load_trip_tables(
+    consumer="dashboard", csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH, artifact_dir=ARTIFACT_DIR,
+    workers=AGGREGATION_WORKERS, return_version=False,
+):
+    """``(df, trip_records)`` from the artifact, building and storing it on a miss.
+
+    ``workers`` only affects how a missing artifact is built, not its contents.
+    With ``return_version`` the ``dataset_version`` the artifact is keyed by is
+    returned as a third element, so callers need not hash the source again.
+    """
+    version = dataset_version(csv_path, snapshot_path)
+    path = artifact_path(consumer, csv_path, snapshot_path, artifact_dir, version)
+    tables = None
+    if os.path.exists(path):
+        try:
+            tables = pd.read_pickle(path)
+            logger.info(f"Loaded trip artifact {path}")
+        except Exception as e:
+            logger.warning(f"Could not read trip artifact {path} ({e}), rebuilding")
+
+    if tables is None:
+        tables = build_trip_tables(consumer, csv_path, snapshot_path, workers)
+        try:
+            _write(path, tables)
+            logger.info(f"Trip artifact written: {path}")
+        except OSError as e:
+            logger.warning(f"Could not write trip artifact {path} ({e})")
+    df, trip_records = tables
+    return (df, trip_records, version) if return_version else (df, trip_records)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    consumer = sys.argv[1] if len(sys.argv) > 1 else "dashboard"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else AGGREGATION_WORKERS
+    load_trip_tables(consumer, workers=workers)
@@ -0,0 +1,43 @@
+"""
+Vectorized bucketing of numeric columns into labelled, ordered categories.
+
+``bucketize`` replaces the per-row ``get_cat`` if/elif chain of the notebook
+exports, whose integer bounds left gaps (50.5 fell through to "Category 1"):
+bins are contiguous, closed on one side, and assigned with one
+``np.searchsorted`` over the edges.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Bin edges (km, or trips per corridor in the notebook) and labels, from nearest to farthest
+DISTANCE_EDGES = [0, 50, 100, 200, 300, 400, 500, np.inf]
+
+DISTANCE_LABELS = [f"Category {i}" for i in range(7, 0, -1)]
+
+
+def bucketize(values, edges=DISTANCE_EDGES, labels=DISTANCE_LABELS, right=True):
+    """Ordered categorical of the bin each value falls in.
+
+    With ``right`` the bins are ``(edges[i], edges[i + 1]]`` and the lowest
+    edge is included; otherwise they are ``[edges[i], edges[i + 1])``.
+    Values outside the edges, and missing values, map to NaN. A Series keeps
+    its index and name.
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    if len(edges) < 2 or np.any(np.diff(edges) <= 0):
+        raise ValueError(f"Bin edges must be strictly increasing, got {edges.tolist()}")
+    if len(labels) != len(edges) - 1:
+        raise ValueError(f"Expected {len(edges) - 1} labels for {len(edges)} edges, got {len(labels)}")
+
+    x = np.asarray(values, dtype=np.float64)
+    codes = np.searchsorted(edges, x, side="left" if right else "right") - 1
+    if right:
+        codes[x == edges[0]] = 0
+    codes[(codes < 0) | (codes >= len(labels)) | np.isnan(x)] = -1
+
+    categories = pd.CategoricalDtype(labels, ordered=True)
+    buckets = pd.Categorical.from_codes(codes, dtype=categories)
+    if isinstance(values, pd.Series):
+        return pd.Series(buckets, index=values.index, name=values.name)
+    return buckets
@@ -0,0 +1,20 @@
+"""
+Integer codes for grouping columns.
+
+The vectorized reductions (route lists, distinct counts) work on dense
+integer codes rather than on the values themselves.
+"""
+
+import pandas as pd
+
+
+def category_codes(values):
+    """``(codes, uniques)`` of a Series, -1 for missing values.
+
+    Categorical columns reuse their codes and categories (in category order)
+    instead of factorizing again; other columns are factorized in order of
+    first appearance.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values)
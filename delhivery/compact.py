@@ -0,0 +1,47 @@
+"""
+Memory-compact representation of trip-level tables.
+
+Identifiers, route types and location names become categoricals and metrics
+become float32, so each dashboard session holds a fraction of the float64 /
+object table. ``memory_report`` breaks a frame's footprint down by column.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def compact_trip_records(trip_records, trip_ids=False):
+    """Return ``trip_records`` with categorical text columns and float32 metrics.
+
+    With ``trip_ids`` an int32 ``trip_id`` column (the trip's code in sorted
+    ``trip_uuid`` order) is added in front, for integer joins and lookups.
+    """
+    columns = {}
+    for col in trip_records.columns:
+        values = trip_records[col]
+        if pd.api.types.is_float_dtype(values.dtype):
+            columns[col] = values.astype(np.float32)
+        elif values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            columns[col] = values.astype("category")
+        else:
+            columns[col] = values
+    compact = pd.DataFrame(columns, index=trip_records.index)
+    if trip_ids:
+        compact.insert(0, "trip_id", compact["trip_uuid"].cat.codes.astype(np.int32))
+    return compact
+
+
+def memory_report(frame):
+    """Deep memory use per column: dtype, bytes and share of the total."""
+    usage = frame.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "dtype": frame.dtypes.astype(str),
+        "bytes": usage,
+        "share": usage / max(usage.sum(), 1),
+    })
+    report.loc["total"] = ["", usage.sum(), 1.0]
+    return report
@@ -0,0 +1,85 @@
+"""
+Origin-destination corridor cube.
+
+Segments are aggregated once into cells keyed by source/destination state and
+city, route type and trip creation day. Each cell holds segment and distinct
+trip counts plus the sum and per-trip mean of the actual/OSRM time and
+distance fields, so corridor charts slice a few thousand cells instead of
+scanning the segment frame on every rerun.
+
+Route type and creation day are per-trip attributes, so a trip's segments for
+one corridor never split across cells of those two keys and distinct counts
+can be summed over them. ``trips`` counts each trip once per city pair;
+``state_trips``, ``source_state_trips`` and ``destination_state_trips`` count
+it once per state pair, source state and destination state (in the cell of
+its first segment there), so their sums stay exact when finer keys are
+rolled up.
+
+The metrics are cumulative within a ``start_scan_to_end_scan`` window, so a
+cell sums the per-window maxima of its trips, as ``aggregate_trips`` does per
+trip, and means divide by the trip count rather than the segment count.
+"""
+
+import numpy as np
+
+from delhivery.aggregation import WINDOW_KEYS
+
+CORRIDOR_KEYS = ["source_state", "source_city", "destination_state", "destination_city", "route_type", "day"]
+
+CORRIDOR_METRICS = ["actual_time", "osrm_time", "actual_distance_to_destination", "osrm_distance"]
+
+# Distinct-trip measures and the keys a slice must keep for their sums to be exact
+DISTINCT_MEASURES = {
+    "trips": ["source_state", "source_city", "destination_state", "destination_city"],
+    "state_trips": ["source_state", "destination_state"],
+    "source_state_trips": ["source_state"],
+    "destination_state_trips": ["destination_state"],
+}
+
+
+def _cell_counts(frame, index):
+    return frame.groupby(CORRIDOR_KEYS, observed=True, dropna=False, sort=False).size().reindex(index, fill_value=0)
+
+
+def corridor_cube(data):
+    """One row per populated corridor cell.
+
+    Missing keys are kept as their own cells, so ``segments`` sums to
+    ``len(data)``.
+    """
+    frame = data[CORRIDOR_KEYS[:-1] + WINDOW_KEYS + CORRIDOR_METRICS].assign(
+        day=data["trip_creation_time"].dt.normalize()
+    )
+    windows = frame.groupby(CORRIDOR_KEYS + WINDOW_KEYS, observed=True, dropna=False, sort=False)
+    windows = windows[CORRIDOR_METRICS].max()
+    cube = windows.groupby(level=CORRIDOR_KEYS, observed=True, dropna=False, sort=True).sum().add_prefix("sum_")
+    cube.insert(0, "segments", _cell_counts(frame, cube.index))
+    for i, (measure, keys) in enumerate(DISTINCT_MEASURES.items(), start=1):
+        cube.insert(i, measure, _cell_counts(frame.drop_duplicates(keys + ["trip_uuid"]), cube.index))
+    return _with_means(cube.reset_index(), "trips")
+
+
+def _with_means(table, trips):
+    for col in CORRIDOR_METRICS:
+        table[f"mean_{col}"] = table[f"sum_{col}"] / np.maximum(table[trips], 1)
+    return table
+
+
+def slice_corridors(cube, by, measure="segments", ascending=False):
+    """Roll ``cube`` up to the ``by`` keys, sorted by ``measure``.
+
+    Sums and counts are added and means recomputed from them. Distinct-trip
+    measures are only kept when ``by`` retains the keys that make their sums
+    exact; means divide by the first one kept (in ``DISTINCT_MEASURES``
+    order) and are left out when none is. Cells with a missing ``by`` key are
+    dropped, as ``groupby`` does.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    distinct = [m for m, keys in DISTINCT_MEASURES.items() if set(keys) <= set(by)]
+    sums = [f"sum_{col}" for col in CORRIDOR_METRICS]
+    table = cube.groupby(by, observed=True, sort=False)[["segments"] + distinct + sums].sum()
+    if distinct:
+        table = _with_means(table, distinct[0])
+    if measure not in table.columns:
+        raise ValueError(f"Measure '{measure}' is not exact when slicing by {by}")
+    return table.sort_values(measure, ascending=ascending, kind="stable").reset_index()
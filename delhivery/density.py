@@ -0,0 +1,30 @@
+"""
+Density rasters for scatter plots of every trip.
+
+Plotting a random ``sample(1000)`` of the trips changes on every rerun and
+hides where the points pile up. ``density_grid`` counts all (x, y) pairs into
+a fixed 2D grid instead; the dashboard draws it as a heatmap, whose payload
+depends only on the number of bins.
+"""
+
+import numpy as np
+import pandas as pd
+
+DENSITY_BINS = 100
+
+
+def density_grid(x, y, bins=DENSITY_BINS, range=None):
+    """2D histogram of the pairs where both ``x`` and ``y`` are finite.
+
+    Counts are laid out as an image: one row per ``y`` bin and one column
+    per ``x`` bin, labelled by bin centers.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    both = np.isfinite(x) & np.isfinite(y)
+    counts, x_edges, y_edges = np.histogram2d(x[both], y[both], bins=bins, range=range)
+    return pd.DataFrame(
+        counts.T.astype(np.int64),
+        index=pd.Index((y_edges[:-1] + y_edges[1:]) / 2, name="y"),
+        columns=pd.Index((x_edges[:-1] + x_edges[1:]) / 2, name="x"),
+    )
@@ -0,0 +1,121 @@
+"""
+Distinct-trip counts per group.
+
+``distinct_counts`` is ``groupby(keys)[ids].nunique()`` over factorized codes:
+the exact mode marks each (group, id) code pair in a bitmap (or hashes the
+pairs when groups x ids is too large for one) and counts them per group, the
+approximate mode keeps a HyperLogLog sketch of ``2**precision``
+registers per group, for exports too large to hold every pair in memory.
+Segment-level ``value_counts`` count a trip once per segment, so rankings of
+trips per state or corridor go through here.
+"""
+
+import numpy as np
+import pandas as pd
+
+from delhivery.codes import category_codes
+
+# HyperLogLog registers per group are 2**DISTINCT_PRECISION (relative error ~1.04 / sqrt(2**p))
+DISTINCT_PRECISION = 12
+
+# Largest key bitmap (one byte per possible key) before falling back to sorting or hashing
+BITMAP_LIMIT = 1 << 26
+
+_POWERS = np.uint64(1) << np.arange(64, dtype=np.uint64)
+
+
+def _group_codes(keys):
+    """Dense group codes (-1 where any key is missing) and the sorted group index."""
+    if isinstance(keys, pd.Series):
+        keys = keys.to_frame()
+    codes, levels = [], []
+    for col in keys.columns:
+        # Categorical keys keep their category order, as groupby does
+        if isinstance(keys[col].dtype, pd.CategoricalDtype):
+            col_codes, uniques = keys[col].cat.codes.to_numpy(), keys[col].cat.categories
+        else:
+            col_codes, uniques = pd.factorize(keys[col], sort=True)
+        codes.append(col_codes.astype(np.int64))
+        levels.append(pd.Index(uniques, name=col))
+
+    present = np.logical_and.reduce([c >= 0 for c in codes])
+    composite = np.zeros(len(keys), dtype=np.int64)
+    for col_codes, level in zip(codes, levels):
+        composite = composite * max(len(level), 1) + np.where(present, col_codes, 0)
+    size = int(np.prod([max(len(level), 1) for level in levels], dtype=np.float64))
+    if size <= BITMAP_LIMIT:
+        # Observed composite keys from a one-byte-per-key bitmap, without sorting the rows
+        observed = np.zeros(size, dtype=bool)
+        observed[composite[present]] = True
+        groups = np.flatnonzero(observed)
+        group_codes = np.searchsorted(groups, composite[present])
+    else:
+        groups, group_codes = np.unique(composite[present], return_inverse=True)
+
+    # Unravel the composite back into one code per key column
+    level_codes, rest = [], groups
+    for level in reversed(levels):
+        level_codes.append(rest % max(len(level), 1))
+        rest = rest // max(len(level), 1)
+    if len(levels) == 1:
+        index = levels[0].take(level_codes[0])
+    else:
+        index = pd.MultiIndex(levels=levels, codes=level_codes[::-1], names=[level.name for level in levels])
+
+    dense = np.full(len(keys), -1, dtype=np.int64)
+    dense[present] = group_codes.ravel()
+    return dense, index
+
+
+def _exact(group_codes, id_codes, n_groups, n_ids):
+    n_ids = max(n_ids, 1)
+    pairs = group_codes * n_ids + id_codes
+    if n_groups * n_ids <= BITMAP_LIMIT:
+        seen = np.zeros(n_groups * n_ids, dtype=bool)
+        seen[pairs] = True
+        pairs = np.flatnonzero(seen)
+    else:
+        pairs = pd.unique(pairs)
+    return np.bincount(pairs // n_ids, minlength=n_groups)
+
+
+def _hyperloglog(group_codes, hashes, n_groups, precision):
+    m = 1 << precision
+    register = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    rest = hashes & ((np.uint64(1) << np.uint64(64 - precision)) - np.uint64(1))
+    # Position of the leftmost 1 bit in the remaining 64 - precision bits
+    bit_length = np.searchsorted(_POWERS, rest, side="right")
+    rank = (64 - precision - bit_length + 1).astype(np.uint8)
+
+    registers = np.zeros(n_groups * m, dtype=np.uint8)
+    np.maximum.at(registers, group_codes * m + register, rank)
+    registers = registers.reshape(n_groups, m)
+
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.ldexp(1.0, -registers.astype(np.int64)).sum(axis=1)
+    # Linear counting while many registers are still empty
+    zeros = (registers == 0).sum(axis=1)
+    small = (estimate <= 2.5 * m) & (zeros > 0)
+    estimate[small] = m * np.log(m / zeros[small])
+    return np.rint(estimate).astype(np.int64)
+
+
+def distinct_counts(keys, ids, approximate=False, precision=DISTINCT_PRECISION):
+    """Number of distinct non-null ``ids`` per group of ``keys`` (a Series or DataFrame).
+
+    Equivalent to ``groupby(keys)[ids].nunique()`` over groups with at least
+    one row: groups sorted, rows with a missing key dropped. With
+    ``approximate`` the counts are HyperLogLog estimates.
+    """
+    group_codes, index = _group_codes(keys)
+    id_codes, id_values = category_codes(ids)
+    id_codes = np.asarray(id_codes, dtype=np.int64)
+    rows = (group_codes >= 0) & (id_codes >= 0)
+    group_codes, id_codes = group_codes[rows], id_codes[rows]
+
+    if approximate:
+        hashes = pd.util.hash_array(np.asarray(id_values, dtype=object))[id_codes]
+        counts = _hyperloglog(group_codes, hashes, len(index), precision)
+    else:
+        counts = _exact(group_codes, id_codes, len(index), len(id_values))
+    return pd.Series(counts, index=index, name=ids.name)
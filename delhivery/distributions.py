@@ -0,0 +1,82 @@
+"""
+Server-side summaries for box and violin plots.
+
+``go.Box`` / ``go.Violin`` / ``px.box`` ship every raw value to the browser,
+which then computes quartiles and kernel densities itself. ``box_summary``
+computes the quartiles, whisker ends and a capped sample of outliers, and
+``kde_curve`` a Gaussian kernel density on a fixed grid, so plots are drawn
+from a few hundred numbers regardless of how many trips there are.
+"""
+
+import numpy as np
+import pandas as pd
+
+BOX_WHISKER = 1.5
+
+# Outliers drawn per box; larger sets are thinned to evenly spaced order statistics
+BOX_OUTLIERS = 500
+
+KDE_POINTS = 200
+
+# Bins the values are counted into before smoothing
+KDE_GRID = 2048
+
+
+def _finite(values):
+    x = np.asarray(values, dtype=np.float64)
+    return x[np.isfinite(x)]
+
+
+def box_summary(values, whisker=BOX_WHISKER, max_outliers=BOX_OUTLIERS):
+    """Quartiles, mean, whisker ends and outliers of the finite ``values``.
+
+    Whiskers end at the most extreme values within ``whisker`` IQRs of the
+    quartiles, as plotly draws them; ``outliers`` holds at most
+    ``max_outliers`` of the ``n_outliers`` values beyond, always including
+    the extremes.
+    """
+    x = np.sort(_finite(values))
+    if len(x) == 0:
+        return {"count": 0, "mean": np.nan, "q1": np.nan, "median": np.nan, "q3": np.nan,
+                "lowerfence": np.nan, "upperfence": np.nan, "outliers": x, "n_outliers": 0}
+    q1, median, q3 = np.quantile(x, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    lo = np.searchsorted(x, q1 - whisker * iqr, side="left")
+    hi = np.searchsorted(x, q3 + whisker * iqr, side="right")
+    outliers = np.concatenate([x[:lo], x[hi:]])
+    n_outliers = len(outliers)
+    if n_outliers > max_outliers:
+        outliers = outliers[np.unique(np.linspace(0, n_outliers - 1, max_outliers).round().astype(np.int64))]
+    return {
+        "count": len(x), "mean": x.mean(), "q1": q1, "median": median, "q3": q3,
+        "lowerfence": x[lo], "upperfence": x[hi - 1], "outliers": outliers, "n_outliers": n_outliers,
+    }
+
+
+def kde_curve(values, points=KDE_POINTS, bandwidth=None):
+    """Gaussian kernel density of the finite ``values`` at ``points`` grid values.
+
+    The values are counted into ``KDE_GRID`` bins and the counts convolved
+    with the kernel, so the cost does not depend on the number of values.
+    ``bandwidth`` defaults to Silverman's rule, as in plotly's violins, and
+    the grid spans the data plus two bandwidths on each side.
+    """
+    x = _finite(values)
+    if len(x) == 0:
+        return pd.DataFrame({"value": np.array([]), "density": np.array([])})
+    if bandwidth is None:
+        q1, q3 = np.quantile(x, [0.25, 0.75])
+        spread = min(x.std(ddof=1) if len(x) > 1 else 0.0, (q3 - q1) / 1.349) or x.std() or 1.0
+        bandwidth = 0.9 * spread * len(x) ** -0.2
+    lo, hi = x.min() - 2 * bandwidth, x.max() + 2 * bandwidth
+
+    counts, edges = np.histogram(x, bins=KDE_GRID, range=(lo, hi))
+    step = edges[1] - edges[0]
+    reach = min(int(np.ceil(4 * bandwidth / step)), (KDE_GRID - 1) // 2)
+    offsets = np.arange(-reach, reach + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.convolve(counts, kernel, mode="same") / len(x)
+
+    grid = np.linspace(lo, hi, points)
+    centers = (edges[:-1] + edges[1:]) / 2
+    return pd.DataFrame({"value": grid, "density": np.interp(grid, centers, density)})
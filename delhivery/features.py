@@ -0,0 +1,117 @@
+"""
+Segment-level feature extraction shared by every loading path.
+
+All transformations are row-wise, so the same function is applied to the full
+frame in ``load_data`` and to each chunk in streaming mode.
+"""
+
+import pandas as pd
+
+from delhivery.codes import category_codes
+from delhivery.normalization import canonical_places
+
+# Minute-valued columns reported in hours
+HOUR_COLUMNS = ["start_scan_to_end_scan", "actual_time", "osrm_time", "segment_actual_time", "segment_osrm_time"]
+
+# Fields parsed out of a facility name such as "Kanpur_Central_H_6 (Uttar Pradesh)"
+PLACE_FIELDS = ["city", "place", "code", "state"]
+
+# Fields sliced out of a center ID such as "IND388121AAA"
+CENTER_FIELDS = ["pincode", "facility_code"]
+
+# Distinct facility name -> parsed fields, shared across calls and streamed chunks
+_PLACES = pd.DataFrame(columns=PLACE_FIELDS, dtype=object)
+
+
+def _broadcast(table, codes, index):
+    # Row i of ``table`` describes distinct value i; code -1 (missing) gives NA
+    return pd.DataFrame(
+        {field: table[field].array.take(codes, allow_fill=True) for field in table.columns}, index=index
+    )
+
+
+def _part(parts, i):
+    # Object dtype keeps the .str accessor usable when every entry is missing
+    return parts.str[i].astype(object)
+
+
+def _parse_names(names):
+    # "Kanpur_Central_H_6 (Uttar Pradesh)" -> "Kanpur", "Central", "H_6", "Uttar Pradesh"
+    parts = names.str.split(" ", n=1)
+    underscored = names.str.split("_", n=2)
+    return pd.DataFrame({
+        "city": _part(_part(parts, 0).str.split("_", n=1), 0),
+        "place": _part(underscored, 1),
+        "code": _part(_part(underscored, 2).str.split(" ", n=1), 0),
+        "state": _part(parts, 1).str.replace("(", "").str.replace(")", ""),
+    }, index=names.index)
+
+
+def parse_place_names(names):
+    """Parsed ``PLACE_FIELDS`` for each distinct name in ``names``, indexed by name.
+
+    Only names not seen before are parsed; results are memoized in ``_PLACES``.
+    """
+    global _PLACES
+    names = pd.Index(names).dropna().unique()
+    new = names.difference(_PLACES.index)
+    if len(new):
+        _PLACES = pd.concat([_PLACES, _parse_names(pd.Series(new, index=new, dtype=object))])
+    return _PLACES.loc[names]
+
+
+def split_place_names(names, fields=PLACE_FIELDS, normalize=True):
+    """Parse a name column into ``fields``, row-aligned with ``names``.
+
+    Each distinct name is parsed once and the results are broadcast back
+    through its category (or factorized) code, so the string work scales with
+    the number of facilities rather than the number of segments. With
+    ``normalize`` city/state aliases are mapped to canonical names on the
+    distinct values before broadcasting.
+    """
+    codes, uniques = category_codes(names)
+    places = parse_place_names(uniques).reindex(uniques)
+    if normalize:
+        places = canonical_places(places)
+    return _broadcast(places[fields], codes, names.index)
+
+
+def split_center_codes(centers, fields=CENTER_FIELDS):
+    """Split center IDs into ``fields``, row-aligned with ``centers``.
+
+    "IND388121AAA" gives pincode 388121 (nullable ``Int32``, missing when the
+    digits are malformed) and facility code "AAA". Slicing runs once per
+    distinct center.
+    """
+    codes, uniques = category_codes(centers)
+    ids = pd.Series(uniques, dtype=object)
+    parsed = pd.DataFrame({
+        "pincode": pd.to_numeric(ids.str[3:9], errors="coerce").astype("Int32"),
+        "facility_code": ids.str[9:],
+    })
+    return _broadcast(parsed[fields], codes, centers.index)
+
+
+def add_features(df):
+    """Add trip-creation calendar fields, city/state (and pincode) columns and hour-valued times."""
+    if "trip_creation_time" in df.columns:
+        df["trip_creation_day"] = df["trip_creation_time"].dt.day_name()
+        df["trip_creation_month"] = df["trip_creation_time"].dt.month_name()
+        df["trip_creation_year"] = df["trip_creation_time"].dt.year
+
+    # Extracting City and State
+    for side in ["source", "destination"]:
+        places = split_place_names(df[f"{side}_name"], ["city", "state"])
+        df[f"{side}_city"] = places["city"]
+        df[f"{side}_state"] = places["state"]
+        if f"{side}_center" in df.columns:
+            df[f"{side}_pincode"] = split_center_codes(df[f"{side}_center"], ["pincode"])["pincode"]
+
+    df["time_taken_btwn_odstart_and_od_end"] = (df["od_end_time"] - df["od_start_time"]) / pd.Timedelta(1, unit="hour")
+
+    for col in HOUR_COLUMNS:
+        df[col] = df[col] / 60
+
+    df["source_city_state"] = df["source_city"] + " " + df["source_state"]
+    df["destination_city_state"] = df["destination_city"] + " " + df["destination_state"]
+    return df
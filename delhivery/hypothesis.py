@@ -0,0 +1,82 @@
+"""
+Two-sample t-tests derived from per-metric moments.
+
+The Hypothesis Testing tabs compared pairs of trip metrics with one
+``ttest_ind`` call each, and the Summary tab repeated all of them. A t-test
+only needs each sample's count, mean and variance: ``metric_moments``
+computes those once per metric, and ``run_tests`` evaluates a declarative
+list of ``HypothesisTest`` specs from them in one vectorized pass.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import t as student_t
+
+HypothesisTest = namedtuple("HypothesisTest", ["name", "a", "b", "alternative", "kind"])
+
+# "student" pools the variances like ttest_ind's default; "welch" does not (equal_var=False)
+TEST_KINDS = ("student", "welch")
+
+ALTERNATIVES = ("two-sided", "greater", "less")
+
+# Tests shown in the dashboard's Hypothesis Testing tabs, in tab order
+HYPOTHESIS_TESTS = [
+    HypothesisTest("Actual vs OSRM Time", "actual_time", "osrm_time", "greater", "student"),
+    HypothesisTest("Actual vs Segment Time", "actual_time", "segment_actual_time", "two-sided", "student"),
+    HypothesisTest("OSRM vs Segment OSRM", "osrm_time", "segment_osrm_time", "less", "student"),
+    HypothesisTest("Actual vs OSRM Distance", "actual_distance_to_destination", "osrm_distance", "two-sided", "student"),
+]
+
+
+def metric_moments(frame, columns=None):
+    """Count, mean and sample variance of each column's non-missing values.
+
+    One row per column (``n``, ``mean``, ``var``), computed in float64 with
+    two passes over the values.
+    """
+    columns = list(frame.columns if columns is None else columns)
+    values = frame[columns].to_numpy(dtype=np.float64)
+    present = np.isfinite(values)
+    n = present.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(present, values, 0.0).sum(axis=0) / n
+        var = (np.where(present, values - mean, 0.0) ** 2).sum(axis=0) / (n - 1)
+    return pd.DataFrame({"n": n, "mean": mean, "var": var}, index=pd.Index(columns, name="metric"))
+
+
+def run_tests(moments, tests=HYPOTHESIS_TESTS):
+    """t statistic, degrees of freedom and p-value of each test in ``tests``.
+
+    ``moments`` is a ``metric_moments`` table covering every metric the tests
+    name. One row per test, indexed by name, with both samples' means.
+    """
+    specs = pd.DataFrame(list(tests), columns=HypothesisTest._fields)
+    unknown = sorted(set(specs["kind"]) - set(TEST_KINDS)) + sorted(set(specs["alternative"]) - set(ALTERNATIVES))
+    if unknown:
+        raise ValueError(f"Unknown test kind or alternative: {unknown}")
+    a = moments.loc[specs["a"]].to_numpy()
+    b = moments.loc[specs["b"]].to_numpy()
+    (n_a, mean_a, var_a), (n_b, mean_b, var_b) = a.T, b.T
+
+    student = (specs["kind"] == "student").to_numpy()
+    share_a, share_b = var_a / n_a, var_b / n_b
+    pooled = ((n_a - 1) * var_a + (n_b - 1) * var_b) / (n_a + n_b - 2)
+    se = np.sqrt(np.where(student, pooled * (1 / n_a + 1 / n_b), share_a + share_b))
+    dof = np.where(
+        student,
+        n_a + n_b - 2,
+        (share_a + share_b) ** 2 / (share_a ** 2 / (n_a - 1) + share_b ** 2 / (n_b - 1)),
+    )
+    statistic = (mean_a - mean_b) / se
+
+    alternative = specs["alternative"].to_numpy()
+    pvalue = np.select(
+        [alternative == "greater", alternative == "less"],
+        [student_t.sf(statistic, dof), student_t.cdf(statistic, dof)],
+        np.minimum(2 * student_t.sf(np.abs(statistic), dof), 1.0),
+    )
+    return specs.assign(
+        statistic=statistic, df=dof, pvalue=pvalue, mean_a=mean_a, mean_b=mean_b,
+    ).set_index("name")
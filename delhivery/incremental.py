@@ -0,0 +1,176 @@
+"""
+Incremental trip aggregation for segment files that land over time.
+
+A store is seeded with the base dataset and keeps the ``TripAccumulator``
+partials (per-window maxima, segment sums, distinct OD durations, first route
+type) next to the current ``trip_records`` and the featurized segments of the
+appended files. Appending a file folds its segments into the partials and
+recomputes only the trips it touches, so a trip whose segments span two files
+(or the base data and a file) ends up with the same values as a full rebuild.
+The dashboard serves the store's ``trip_records`` and the base segments plus
+the appended ones when a store for the current dataset version exists.
+
+Usage:
+    python -m delhivery.incremental <store_dir> <segments.csv> [<segments.csv> ...]
+"""
+
+import hashlib
+import logging
+import os
+import sys
+
+import pandas as pd
+
+from delhivery.aggregation import TripAccumulator
+from delhivery.artifacts import dataset_version, source_hash, write_pickle
+from delhivery.features import add_features
+from delhivery.snapshot import CSV_PATH, SNAPSHOT_PATH, iter_segments
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = ".delhivery_store"
+
+STORE_FILE = "trip_store.pkl"
+
+
+def _fold(store, csv_path, snapshot_path, chunksize, keep_segments=True):
+    accumulator, affected, segments = store["accumulator"], set(), []
+    for chunk in iter_segments("dashboard", chunksize, csv_path=csv_path, snapshot_path=snapshot_path):
+        chunk = add_features(chunk)
+        accumulator.add(chunk)
+        affected.update(chunk["trip_uuid"].dropna().astype(object).unique())
+        if keep_segments:
+            segments.append(chunk)
+
+    # Only trips with segments in this file change; the rest are kept as-is
+    updated = accumulator.result(list(affected))
+    trip_records = store["trip_records"]
+    if trip_records is not None:
+        kept = trip_records[~trip_records["trip_uuid"].isin(affected)]
+        updated = pd.concat([kept, updated]).sort_values("trip_uuid")
+    store["trip_records"] = updated.reset_index(drop=True)
+    if segments:
+        store["segments"] = pd.concat(
+            ([] if store["segments"] is None else [store["segments"]]) + segments, ignore_index=True
+        )
+    return affected
+
+
+def new_store(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH, chunksize=500_000):
+    """A store seeded with the base dataset, so its ``trip_records`` cover the full history.
+
+    The base segments themselves are not kept; they already live in the
+    dashboard's trip artifact.
+    """
+    store = {
+        "accumulator": TripAccumulator(), "trip_records": None, "segments": None, "sources": [],
+        "base_version": dataset_version(csv_path, snapshot_path),
+    }
+    _fold(store, csv_path, snapshot_path, chunksize, keep_segments=False)
+    logger.info(f"Seeded trip store with {len(store['trip_records'])} trips from {csv_path}")
+    return store
+
+
+def rebuild_store(sources, store_dir=STORE_DIR, chunksize=500_000):
+    """Seed a fresh store from the base dataset and re-append the recorded ``(csv_path, digest)`` sources.
+
+    Sources that are gone or whose content changed are skipped with a
+    warning, so the store falls back to the base data plus whatever files
+    are still available.
+    """
+    store = new_store(chunksize=chunksize)
+    for source in sources:
+        csv_path, digest = source if isinstance(source, tuple) else (None, source)
+        if csv_path is None or not os.path.exists(csv_path) or source_hash(csv_path) != digest:
+            logger.warning(f"Dropping {csv_path or digest} from trip store {store_dir}: file is missing or has changed")
+            continue
+        _fold(store, csv_path, csv_path + ".parquet", chunksize)
+        store["sources"].append((csv_path, digest))
+    write_pickle(store, store_path(store_dir))
+    logger.info(f"Rebuilt trip store {store_dir} with {len(store['sources'])} of {len(sources)} appended files")
+    return store
+
+
+def store_path(store_dir=STORE_DIR):
+    return os.path.join(store_dir, STORE_FILE)
+
+
+def store_mtime(store_dir=STORE_DIR):
+    """Modification time (ns) of the store file, or None without a store; changes on every append."""
+    path = store_path(store_dir)
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+def store_version(store):
+    """Key of the store's base dataset version and appended sources."""
+    digests = ",".join(digest for _, digest in store["sources"])
+    return hashlib.blake2b(f"{store['base_version']}:{digests}".encode(), digest_size=16).hexdigest()
+
+
+def combined_segments(base, store):
+    """The base segments followed by the store's appended ones, keeping the base's categorical columns."""
+    if store["segments"] is None:
+        return base
+    combined = pd.concat([base, store["segments"]], ignore_index=True)
+    for col in base.columns:
+        categorical = isinstance(base[col].dtype, pd.CategoricalDtype)
+        if categorical and not isinstance(combined[col].dtype, pd.CategoricalDtype):
+            combined[col] = combined[col].astype("category")
+    return combined
+
+
+def load_store(store_dir=STORE_DIR, version=None, rebuild=True):
+    """Read the store for the current dataset ``version`` (default: ``dataset_version()``).
+
+    The store is a dict with the ``accumulator`` partials, the current
+    ``trip_records``, the appended featurized ``segments``, the appended
+    ``sources`` as ``(csv_path, digest)`` pairs and the ``base_version`` it was
+    seeded from. Without a store file a new one is seeded. A store seeded
+    from other base data or by another pipeline version is stale: with
+    ``rebuild`` it is rebuilt from the base dataset and its recorded sources,
+    otherwise None is returned and the caller should fall back to the base
+    data.
+    """
+    version = dataset_version() if version is None else version
+    path = store_path(store_dir)
+    if not os.path.exists(path):
+        return new_store() if rebuild else None
+    try:
+        store = pd.read_pickle(path)
+        stale = store.get("base_version") != version
+    except Exception as e:
+        logger.warning(f"Could not read trip store {path} ({e})")
+        store, stale = {"sources": []}, True
+    if not stale:
+        return store
+    if not rebuild:
+        logger.warning(f"Trip store {path} was built from other data or another pipeline version, ignoring it")
+        return None
+    logger.warning(f"Trip store {path} was built from other data or another pipeline version, rebuilding it")
+    return rebuild_store(store["sources"], store_dir)
+
+
+def append_segments(csv_path, store_dir=STORE_DIR, chunksize=500_000):
+    """Fold one segment CSV into the store and return the updated ``trip_records``.
+
+    A file whose content was already appended is skipped, since segment sums
+    are not idempotent.
+    """
+    store = load_store(store_dir)
+    digest = source_hash(csv_path)
+    if digest in {appended for _, appended in store["sources"]}:
+        logger.warning(f"{csv_path} was already appended to {store_dir}, skipping")
+        return store["trip_records"]
+
+    csv_path = os.path.abspath(csv_path)
+    affected = _fold(store, csv_path, csv_path + ".parquet", chunksize)
+    store["sources"].append((csv_path, digest))
+    write_pickle(store, store_path(store_dir))
+    logger.info(f"Appended {csv_path}: {len(affected)} trips updated, {len(store['trip_records'])} in total")
+    return store["trip_records"]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    for path in sys.argv[2:]:
+        append_segments(path, sys.argv[1])
@@ -0,0 +1,43 @@
+"""
+Canonical city and state names for parsed facility names.
+
+The alias table lives in ``data/place_aliases.json`` as
+``{"version": n, "state": {alias: canonical}, "city": {alias: canonical}}``,
+so adding a hub alias is a data change. Aliases are applied to the distinct
+parsed names, never to segment rows.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "place_aliases.json")
+
+# Parsed place fields that have aliases
+ALIAS_FIELDS = ["city", "state"]
+
+
+@lru_cache(maxsize=None)
+def load_aliases(path=ALIASES_PATH):
+    """Read and validate the alias table (cached per path)."""
+    with open(path, encoding="utf-8") as f:
+        table = json.load(f)
+    missing = [key for key in ["version"] + ALIAS_FIELDS if key not in table]
+    if missing:
+        raise ValueError(f"Alias table {path} is missing {missing}")
+    return table
+
+
+def aliases_version(path=ALIASES_PATH):
+    """Version number of the alias table at ``path``."""
+    return load_aliases(path)["version"]
+
+
+def canonical_places(places, path=ALIASES_PATH):
+    """Return a copy of a parsed place table with city/state aliases replaced."""
+    aliases = load_aliases(path)
+    places = places.copy()
+    for field in ALIAS_FIELDS:
+        if field in places.columns:
+            places[field] = places[field].replace(aliases[field])
+    return places
@@ -0,0 +1,91 @@
+"""
+Closed-form least-squares trendlines from sufficient statistics.
+
+plotly's ``trendline="ols"`` imports statsmodels and refits a model on the
+plotted points on every rerun. A simple regression of y on x only depends on
+n, Σx, Σy, Σxy, Σx² and Σy², and those sums add up across groups:
+``regression_moments`` accumulates them once per group when the trips are
+loaded, and a filtered fit sums the selected groups' rows before
+``ols_fit`` derives slope, intercept, R² and the residual spread.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import t as student_t
+
+MOMENT_COLUMNS = ["n", "sum_x", "sum_y", "sum_xy", "sum_xx", "sum_yy"]
+
+# (x, y) column pairs the dashboard draws trendlines for
+REGRESSION_PAIRS = [
+    ("osrm_time", "actual_time"),
+    ("osrm_distance", "actual_distance_to_destination"),
+    ("segment_osrm_time", "osrm_time"),
+]
+
+CONFIDENCE_LEVEL = 0.95
+
+
+def regression_moments(frame, pairs=REGRESSION_PAIRS, by=()):
+    """Sufficient statistics of each (x, y) pair per group of ``by``.
+
+    Rows where x or y is missing are left out, as statsmodels does. One row
+    per group and pair: the ``by`` keys, the ``x`` and ``y`` column names and
+    ``MOMENT_COLUMNS``.
+    """
+    by = list(by)
+    tables = []
+    for x, y in pairs:
+        xs = frame[x].to_numpy(dtype=np.float64)
+        ys = frame[y].to_numpy(dtype=np.float64)
+        both = np.isfinite(xs) & np.isfinite(ys)
+        xs, ys = np.where(both, xs, 0.0), np.where(both, ys, 0.0)
+        terms = pd.DataFrame({
+            "n": both.astype(np.int64), "sum_x": xs, "sum_y": ys,
+            "sum_xy": xs * ys, "sum_xx": xs * xs, "sum_yy": ys * ys,
+        }, index=frame.index)
+        if by:
+            sums = terms.join(frame[by]).groupby(by, observed=True, dropna=False)[MOMENT_COLUMNS].sum().reset_index()
+        else:
+            sums = terms.sum().to_frame().T.astype({"n": np.int64})
+        tables.append(sums.assign(x=x, y=y))
+    return pd.concat(tables, ignore_index=True)[by + ["x", "y"] + MOMENT_COLUMNS]
+
+
+def ols_fit(moments):
+    """Least-squares fit of y on x from one set of ``MOMENT_COLUMNS`` sums.
+
+    Returns ``n``, ``slope``, ``intercept``, ``r_squared``, ``mean_x``,
+    ``ss_x`` (centered Σx²) and ``residual_std``; all but ``n`` are NaN when
+    fewer than three points or a constant x leave the fit undetermined.
+    """
+    n = int(moments["n"])
+    if n < 3:
+        return {"n": n, "slope": np.nan, "intercept": np.nan, "r_squared": np.nan,
+                "mean_x": np.nan, "ss_x": np.nan, "residual_std": np.nan}
+    mean_x, mean_y = moments["sum_x"] / n, moments["sum_y"] / n
+    ss_x = max(moments["sum_xx"] - n * mean_x * mean_x, 0.0)
+    ss_y = max(moments["sum_yy"] - n * mean_y * mean_y, 0.0)
+    ss_xy = moments["sum_xy"] - n * mean_x * mean_y
+    slope = ss_xy / ss_x if ss_x > 0 else np.nan
+    residual = max(ss_y - slope * ss_xy, 0.0)
+    return {
+        "n": n,
+        "slope": slope,
+        "intercept": mean_y - slope * mean_x,
+        "r_squared": 1 - residual / ss_y if ss_y > 0 else np.nan,
+        "mean_x": mean_x,
+        "ss_x": ss_x,
+        "residual_std": np.sqrt(residual / (n - 2)),
+    }
+
+
+def confidence_band(fit, x, level=CONFIDENCE_LEVEL):
+    """Fitted line and ``level`` confidence band of the mean response at ``x``.
+
+    One row per ``x`` value with ``fit``, ``lower`` and ``upper``.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    line = fit["intercept"] + fit["slope"] * x
+    half_width = (student_t.ppf((1 + level) / 2, fit["n"] - 2) * fit["residual_std"]
+                  * np.sqrt(1 / fit["n"] + (x - fit["mean_x"]) ** 2 / fit["ss_x"]))
+    return pd.DataFrame({"x": x, "fit": line, "lower": line - half_width, "upper": line + half_width})
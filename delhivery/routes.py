@@ -0,0 +1,149 @@
+"""
+Typed per-group reductions of location columns.
+
+These replace list-valued ``groupby(...).unique()`` aggregates, whose object
+arrays were later stringified and stripped with
+``astype("str").str.strip("[]")``. Per trip they give the first source and
+last destination. Per route they give distinct counts and ``StopLists``: each
+group's distinct values in order of first appearance, stored as one offsets
+array plus one categorical values array.
+"""
+
+import numpy as np
+import pandas as pd
+
+from delhivery.aggregation import first_distinct, group_sum
+from delhivery.codes import category_codes
+
+# Location fields carried onto trip-level tables
+LOCATION_COLUMNS = [
+    "source_city", "destination_city", "source_city_state", "destination_city_state",
+    "source_state", "destination_state",
+]
+
+# Segment column -> route_records list column, in output order
+ROUTE_LIST_COLUMNS = {
+    "destination_state": "destination_states",
+    "source_state": "source_states",
+    "source_city": "source_cities",
+    "route_type": "route_type",
+    "destination_city": "destination_cities",
+}
+
+
+class StopLists:
+    """Ordered distinct values per group, as ``offsets`` plus ``values``.
+
+    Group ``i`` (labelled ``index[i]``) owns ``values[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(self, offsets, values, index):
+        self.offsets = offsets
+        self.values = values
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        return list(self.values[self.offsets[i]:self.offsets[i + 1]])
+
+    def counts(self):
+        """Number of distinct values per group."""
+        return pd.Series(np.diff(self.offsets), index=self.index)
+
+    def _at(self, positions, present):
+        codes = np.full(len(self), -1, dtype=np.int64)
+        codes[present] = self.values.codes[positions[present]]
+        return pd.Series(pd.Categorical.from_codes(codes, self.values.categories), index=self.index)
+
+    def first(self):
+        """First value of each group (NaN for empty groups)."""
+        return self._at(self.offsets[:-1], np.diff(self.offsets) > 0)
+
+    def last(self):
+        """Last distinct value of each group (NaN for empty groups)."""
+        return self._at(self.offsets[1:] - 1, np.diff(self.offsets) > 0)
+
+    def join(self, sep=" "):
+        """Each group's values joined with ``sep``.
+
+        Strings are assembled in lock-step, one position of every group at a
+        time, so the loop runs once per value of the longest group.
+        """
+        counts = np.diff(self.offsets)
+        values = np.asarray(self.values.astype(str), dtype=object)
+        joined = np.full(len(self), "", dtype=object)
+        for k in range(counts.max(initial=0)):
+            has = counts > k
+            piece = values[self.offsets[:-1][has] + k]
+            joined[has] = piece if k == 0 else joined[has] + sep + piece
+        return pd.Series(joined, index=self.index)
+
+
+def _stop_lists(group_codes, groups, column):
+    value_codes, categories = category_codes(column)
+    rows = np.flatnonzero((group_codes >= 0) & (value_codes >= 0))
+    group_codes, value_codes = group_codes[rows], value_codes[rows]
+
+    first = first_distinct(group_codes, value_codes.astype(np.float64))
+    group_codes, value_codes = group_codes[first], value_codes[first]
+    # Rows are still in file order, so a stable sort keeps first-appearance order
+    order = np.argsort(group_codes, kind="stable")
+    offsets = np.r_[0, np.cumsum(np.bincount(group_codes, minlength=len(groups)))]
+    values = pd.Categorical.from_codes(value_codes[order], pd.Index(categories))
+    return StopLists(offsets, values, groups)
+
+
+def ordered_distinct(data, by, column):
+    """``StopLists`` of the distinct non-null ``column`` values per ``by`` group.
+
+    Equivalent to ``data.groupby(by)[column].unique()`` without missing
+    values, with groups sorted and values in order of first appearance.
+    """
+    group_codes, groups = pd.factorize(data[by], sort=True)
+    return _stop_lists(group_codes, pd.Index(groups, name=by), data[column])
+
+
+def trip_locations(data, columns=LOCATION_COLUMNS):
+    """First source and last destination location of each trip, in row order."""
+    grouped = data.groupby("trip_uuid", observed=True, sort=True)
+    sources = grouped[[col for col in columns if col.startswith("source_")]].first()
+    destinations = grouped[[col for col in columns if col.startswith("destination_")]].last()
+    return sources.join(destinations)[columns].reset_index()
+
+
+def build_route_records(data, trip_records):
+    """Route-level summary of a featurized segment frame, one row per route.
+
+    Every list column shares one factorization of ``route_schedule_uuid``.
+    Trip counts and the average ``actual_distance_to_destination`` come from
+    ``trip_records`` (each trip counted on its first route). Routes without
+    an aggregated trip are dropped. The result is indexed by
+    ``route_schedule_uuid``.
+    """
+    group_codes, routes = pd.factorize(data["route_schedule_uuid"], sort=True)
+    routes = pd.Index(routes, name="route_schedule_uuid")
+    lists = {name: _stop_lists(group_codes, routes, data[col]) for col, name in ROUTE_LIST_COLUMNS.items()}
+
+    trip_route = data.groupby("trip_uuid", observed=True)["route_schedule_uuid"].first()
+    trips = trip_records[["trip_uuid", "actual_distance_to_destination"]].join(trip_route, on="trip_uuid")
+    trip_codes = routes.get_indexer(trips["route_schedule_uuid"])
+    counted = trip_codes >= 0
+    n_trips = np.bincount(trip_codes[counted], minlength=len(routes))
+    distance = group_sum(trip_codes[counted], trips["actual_distance_to_destination"].to_numpy(dtype=np.float64)[counted], len(routes))
+
+    sources, destinations = lists["source_cities"], lists["destination_cities"]
+    joined = {name: stops.join(" ") for name, stops in lists.items()}
+    route_records = pd.DataFrame({
+        "SouceToDestination_city": sources.first().astype(object).fillna("") + " TO " + destinations.last().astype(object).fillna(""),
+        "ROUTE": joined["source_cities"] + " -- " + joined["destination_cities"],
+        "#source_cities": sources.counts(),
+        "#destination_cities": destinations.counts(),
+        "Number_of_Trips": n_trips,
+        "Average_Actual_distance_to_destination": distance / np.maximum(n_trips, 1),
+        "#source_states": lists["source_states"].counts(),
+        "#destination_states": lists["destination_states"].counts(),
+        **joined,
+    }, index=routes)
+    return route_records[n_trips > 0]
@@ -0,0 +1,72 @@
+"""
+Column schema for the raw Delhivery segment table.
+
+Every entry point reads the dataset through ``delhivery.load_segments`` with
+one of the consumer names below, so only the columns that consumer actually
+uses are parsed, each with an explicit dtype instead of pandas inference.
+"""
+
+COLUMNS = [
+    "data", "trip_creation_time", "route_schedule_uuid", "route_type", "trip_uuid",
+    "source_center", "source_name", "destination_center", "destination_name",
+    "od_start_time", "od_end_time", "start_scan_to_end_scan",
+    "is_cutoff", "cutoff_factor", "cutoff_timestamp",
+    "actual_distance_to_destination", "actual_time", "osrm_time", "osrm_distance",
+    "factor", "segment_actual_time", "segment_osrm_time", "segment_osrm_distance",
+    "segment_factor",
+]
+
+# Parsed after reading; fixed "YYYY-MM-DD HH:MM:SS.ffffff" strings in the CSV
+DATETIME_COLUMNS = ["trip_creation_time", "od_start_time", "od_end_time"]
+
+# Low-cardinality identifiers and names are held as categoricals
+CATEGORICAL_COLUMNS = [
+    "data", "route_schedule_uuid", "route_type", "trip_uuid",
+    "source_center", "source_name", "destination_center", "destination_name",
+]
+
+DTYPES = {
+    **{col: "category" for col in CATEGORICAL_COLUMNS},
+    "start_scan_to_end_scan": "float64",
+    "is_cutoff": "bool",
+    "cutoff_factor": "int64",
+    "cutoff_timestamp": "object",
+    "actual_distance_to_destination": "float64",
+    "actual_time": "float64",
+    "osrm_time": "float64",
+    "osrm_distance": "float64",
+    "factor": "float64",
+    "segment_actual_time": "float64",
+    "segment_osrm_time": "float64",
+    "segment_osrm_distance": "float64",
+    "segment_factor": "float64",
+}
+
+# Fields no analysis reads
+UNUSED_COLUMNS = ["data", "is_cutoff", "cutoff_factor", "cutoff_timestamp", "factor", "segment_factor"]
+
+CONSUMER_COLUMNS = {
+    # app.py load_data and EDA/delhivery_solution.py, through the shared trip artifact
+    "dashboard": [
+        "trip_creation_time", "route_schedule_uuid", "route_type", "trip_uuid", "source_name", "destination_name",
+        "od_start_time", "od_end_time", "start_scan_to_end_scan",
+        "actual_distance_to_destination", "actual_time", "osrm_time", "osrm_distance",
+        "segment_actual_time", "segment_osrm_time", "segment_osrm_distance",
+    ],
+    # Notebook exports: Delhivery Final.py, EDA/delhivery_analysis.py, EDA/run_analysis.py
+    "notebook": [col for col in COLUMNS if col not in UNUSED_COLUMNS],
+    "all": COLUMNS,
+}
+
+
+def columns_for(consumer):
+    """Columns read for ``consumer``, in file order."""
+    if consumer not in CONSUMER_COLUMNS:
+        raise ValueError(f"Unknown consumer '{consumer}', expected one of {sorted(CONSUMER_COLUMNS)}")
+    wanted = set(CONSUMER_COLUMNS[consumer])
+    return [col for col in COLUMNS if col in wanted]
+
+
+def dtypes_for(columns):
+    """read_csv dtype map restricted to ``columns`` (datetimes are parsed separately)."""
+    return {col: DTYPES[col] for col in columns if col in DTYPES}
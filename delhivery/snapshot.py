@@ -0,0 +1,109 @@
+"""
+Typed columnar snapshot of the raw segment CSV.
+
+Parsing the 53 MB CSV dominates cold start, so the ingest step below writes a
+compressed Parquet copy once (datetimes as timestamps, identifiers as
+dictionary-encoded categoricals, floats as float32 where that is lossless).
+Consumers call ``load_segments`` and fall back to the CSV when the snapshot is
+missing, stale or pyarrow is not installed.
+
+Usage:
+    python -m delhivery.snapshot [delhivery_data.csv] [delhivery_data.parquet]
+"""
+
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from delhivery.schema import COLUMNS, DATETIME_COLUMNS, columns_for, dtypes_for
+from delhivery.timestamps import decode_timestamps
+
+logger = logging.getLogger(__name__)
+
+CSV_PATH = "delhivery_data.csv"
+SNAPSHOT_PATH = "delhivery_data.parquet"
+
+
+def _snapshot_is_fresh(csv_path, snapshot_path):
+    if not os.path.exists(snapshot_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.path.getmtime(snapshot_path) >= os.path.getmtime(csv_path)
+
+
+def _downcast_floats(df):
+    # Only narrow a column when every value survives the float32 round trip,
+    # so reading the snapshot back gives the same numbers as the CSV.
+    for col in df.select_dtypes(include="float64").columns:
+        narrow = df[col].astype(np.float32)
+        if narrow.astype(np.float64).equals(df[col]):
+            df[col] = narrow
+    return df
+
+
+def read_csv(csv_path=CSV_PATH, columns=None):
+    """Read the raw CSV with schema dtypes, parsing only ``columns``."""
+    columns = COLUMNS if columns is None else columns
+    df = pd.read_csv(csv_path, usecols=columns, dtype=dtypes_for(columns))
+    return decode_timestamps(df, DATETIME_COLUMNS)
+
+
+def write_snapshot(csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Parse the CSV once and write the typed Parquet snapshot."""
+    df = _downcast_floats(read_csv(csv_path))
+    df.to_parquet(snapshot_path, engine="pyarrow", compression="zstd", index=False)
+    logger.info(f"Snapshot written: {snapshot_path} {df.shape}")
+    return snapshot_path
+
+
+def read_snapshot(snapshot_path=SNAPSHOT_PATH, columns=None):
+    """Read ``columns`` of the snapshot back with schema dtypes."""
+    df = pd.read_parquet(snapshot_path, engine="pyarrow", columns=columns)
+    return df.astype(dtypes_for(df.columns))
+
+
+def iter_segments(consumer="all", chunksize=500_000, csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Yield the columns ``consumer`` needs in frames of at most ``chunksize`` rows."""
+    columns = columns_for(consumer)
+    if _snapshot_is_fresh(csv_path, snapshot_path):
+        try:
+            import pyarrow.parquet as pq
+
+            batches = pq.ParquetFile(snapshot_path).iter_batches(batch_size=chunksize, columns=columns)
+            for batch in batches:
+                chunk = batch.to_pandas()
+                yield chunk.astype(dtypes_for(chunk.columns))
+            return
+        except ImportError:
+            logger.warning("pyarrow is not installed, streaming from CSV")
+
+    reader = pd.read_csv(csv_path, usecols=columns, dtype=dtypes_for(columns), chunksize=chunksize)
+    for chunk in reader:
+        yield decode_timestamps(chunk, DATETIME_COLUMNS)
+
+
+def load_segments(consumer="all", csv_path=CSV_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Load the columns ``consumer`` needs, preferring the snapshot over the CSV."""
+    columns = columns_for(consumer)
+    if _snapshot_is_fresh(csv_path, snapshot_path):
+        try:
+            df = read_snapshot(snapshot_path, columns)
+            logger.info(f"Loaded snapshot {snapshot_path}: {df.shape}")
+            return df
+        except ImportError:
+            logger.warning("pyarrow is not installed, falling back to CSV")
+        except Exception as e:
+            logger.warning(f"Could not read snapshot {snapshot_path} ({e}), falling back to CSV")
+
+    df = read_csv(csv_path, columns)
+    logger.info(f"Loaded CSV {csv_path}: {df.shape}")
+    return df
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    write_snapshot(*sys.argv[1:3])
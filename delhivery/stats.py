@@ -0,0 +1,150 @@
+"""
+Memoized summary statistics shared by every dashboard session.
+
+Streamlit reruns the whole script on each widget interaction, recomputing the
+same ``describe()``, ``corr()`` and ``value_counts()`` tables, histograms,
+box/violin summaries, scatter densities, trendlines and t-tests in several
+tabs. ``StatisticsCache`` computes each one once per (dataset version, table,
+statistic, columns, filter[, bin spec]) and keeps the most recently used
+``maxsize`` results, counting hits and misses.
+"""
+
+import copy
+import logging
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from delhivery.density import DENSITY_BINS, density_grid
+from delhivery.distributions import box_summary, kde_curve
+from delhivery.histograms import HISTOGRAM_BINS, histogram
+from delhivery.hypothesis import HYPOTHESIS_TESTS, metric_moments, run_tests
+from delhivery.regression import MOMENT_COLUMNS, ols_fit
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_SIZE = int(os.environ.get("DELHIVERY_STATS_CACHE_SIZE", "128"))
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+STATISTICS = {
+    "describe": lambda frame: frame.describe(),
+    "corr": lambda frame: frame.corr(),
+    "value_counts": lambda frame: frame.iloc[:, 0].value_counts(),
+    "box": lambda frame: box_summary(frame.iloc[:, 0]),
+    "kde": lambda frame: kde_curve(frame.iloc[:, 0]),
+    "moments": metric_moments,
+}
+
+
+def _select(frame, columns, filter):
+    selected = frame[list(columns) + [col for col, _ in filter if col not in columns]]
+    for col, values in filter:
+        selected = selected[selected[col].isin(values)]
+    return selected[list(columns)]
+
+
+class StatisticsCache:
+    """Bounded LRU cache of summary tables, safe to share across sessions (threads).
+
+    ``filter`` is a tuple of ``(column, values)`` pairs; rows are kept where
+    each column is in its values. Results are returned as deep copies (box
+    summaries hold numpy arrays), so callers can never modify a cached entry.
+    """
+
+    def __init__(self, maxsize=STATS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+
+        result = compute()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        logger.debug(f"Computed {key[2]} of {key[1]}{list(key[3])} for version {key[0]}")
+        return copy.deepcopy(result)
+
+    def summary(self, statistic, version, table, frame, columns=None, filter=()):
+        """``statistic`` of ``frame[columns]`` (after ``filter``), computed on a miss."""
+        columns = tuple(frame.columns if columns is None else columns)
+        filter = tuple((col, tuple(values)) for col, values in filter)
+        return self._lookup(
+            (version, table, statistic, columns, filter),
+            lambda: STATISTICS[statistic](_select(frame, columns, filter)),
+        )
+
+    def histogram(self, version, table, frame, column, bins=HISTOGRAM_BINS, range=None, filter=()):
+        """``histogram`` of ``frame[column]`` (after ``filter``), cached per bin spec."""
+        filter = tuple((col, tuple(values)) for col, values in filter)
+        range = None if range is None else tuple(float(edge) for edge in range)
+        return self._lookup(
+            (version, table, "histogram", (column,), filter, bins, range),
+            lambda: histogram(_select(frame, [column], filter)[column], bins, range),
+        )
+
+    def density(self, version, table, frame, x, y, bins=DENSITY_BINS, range=None, filter=()):
+        """``density_grid`` of ``frame[x]`` against ``frame[y]`` (after ``filter``), cached per bin spec."""
+        filter = tuple((col, tuple(values)) for col, values in filter)
+        range = None if range is None else tuple(tuple(float(edge) for edge in axis) for axis in range)
+        return self._lookup(
+            (version, table, "density", (x, y), filter, bins, range),
+            lambda: density_grid(*_select(frame, [x, y], filter).T.to_numpy(), bins, range),
+        )
+
+    def regression(self, version, table, moments, x, y, filter=()):
+        """``ols_fit`` of ``y`` on ``x`` from a ``regression_moments`` table, summed over the groups kept by ``filter``."""
+        filter = tuple((col, tuple(values)) for col, values in filter)
+        pair = (("x", (x,)), ("y", (y,)))
+        return self._lookup(
+            (version, table, "regression", (x, y), filter),
+            lambda: ols_fit(_select(moments, MOMENT_COLUMNS, pair + filter).sum()),
+        )
+
+    def hypothesis_tests(self, version, table, frame, tests=HYPOTHESIS_TESTS, filter=()):
+        """``run_tests`` results for ``tests``, from the cached ``moments`` of every metric they name."""
+        tests = tuple(tests)
+        columns = list(dict.fromkeys(metric for test in tests for metric in (test.a, test.b)))
+        return self._lookup(
+            (version, table, "hypothesis_tests", tests, tuple((col, tuple(values)) for col, values in filter)),
+            lambda: run_tests(self.moments(version, table, frame, columns, filter), tests),
+        )
+
+    def describe(self, version, table, frame, columns=None, filter=()):
+        return self.summary("describe", version, table, frame, columns, filter)
+
+    def corr(self, version, table, frame, columns=None, filter=()):
+        return self.summary("corr", version, table, frame, columns, filter)
+
+    def value_counts(self, version, table, frame, column, filter=()):
+        return self.summary("value_counts", version, table, frame, [column], filter)
+
+    def box(self, version, table, frame, column, filter=()):
+        return self.summary("box", version, table, frame, [column], filter)
+
+    def kde(self, version, table, frame, column, filter=()):
+        return self.summary("kde", version, table, frame, [column], filter)
+
+    def moments(self, version, table, frame, columns=None, filter=()):
+        return self.summary("moments", version, table, frame, columns, filter)
+
+    def cache_info(self):
+        """Hits, misses, capacity and current size, like ``functools.lru_cache``."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
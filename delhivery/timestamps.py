@@ -0,0 +1,50 @@
+"""
+Decoding of the fixed-layout timestamp columns.
+
+Every timestamp in the export is written as ``YYYY-MM-DD HH:MM:SS.ffffff``,
+and rows come grouped by trip, so ``trip_creation_time`` (and the OD times
+within a leg) repeat in consecutive runs. Each run is parsed once with the
+known format instead of inferring the layout row by row.
+"""
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def parse_timestamps(values, format=TIMESTAMP_FORMAT):
+    """Parse timestamp strings, decoding each run of repeated values once.
+
+    Falls back to per-value format inference when a value does not match
+    ``format``. Returns a ``datetime64[ns]`` array aligned with ``values``.
+    """
+    values = np.asarray(values, dtype=object)
+    if len(values) == 0:
+        return np.array([], dtype="datetime64[ns]")
+    heads = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    try:
+        parsed = pd.to_datetime(values[heads], format=format)
+    except ValueError:
+        logger.warning(f"Timestamps do not match {format}, inferring the format per value")
+        parsed = pd.to_datetime(values[heads], format="mixed")
+    return np.repeat(parsed.to_numpy(dtype="datetime64[ns]"), np.diff(np.r_[heads, len(values)]))
+
+
+def decode_timestamps(df, columns, format=TIMESTAMP_FORMAT):
+    """Replace the string ``columns`` of ``df`` with datetimes and log parse throughput."""
+    columns = [col for col in columns if col in df.columns]
+    if not columns:
+        return df
+    start = time.perf_counter()
+    for col in columns:
+        df[col] = parse_timestamps(df[col].to_numpy(), format)
+    elapsed = time.perf_counter() - start
+    count = len(df) * len(columns)
+    logger.info(f"Parsed {count:,} timestamps in {elapsed:.3f}s ({count / max(elapsed, 1e-9):,.0f}/s)")
+    return df
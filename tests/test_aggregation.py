@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from delhivery.aggregation import aggregate_trips, aggregate_trips_parallel
+from delhivery.features import add_features
+
+
+def _segments():
+    # Trips "a" and "b" are interleaved and b's first scan window resumes after
+    # its second one; trip "c" has missing facility names and a missing actual_time
+    rows = [
+        ("a", "Carting", "Anand_VUNagar_DC (Gujarat)", "Khambhat_MotvdDPP_D (Gujarat)", 86.0, 10.0, 9.0, 10.0, 10.0, 11.0, 7.0, 5.0),
+        ("b", "FTL", "Bhiwandi_Mankoli_HB (Maharashtra)", "Pune_Tathawde_H (Maharashtra)", 240.0, 60.0, 40.0, 60.0, 40.0, 55.0, 70.0, 50.0),
+        ("a", "Carting", "Anand_VUNagar_DC (Gujarat)", "Khambhat_MotvdDPP_D (Gujarat)", 86.0, 25.0, 20.0, 15.0, 11.0, 30.0, 24.0, 12.0),
+        ("b", "FTL", "Pune_Tathawde_H (Maharashtra)", "Bangalore_Nelmngla_H (Karnataka)", 900.0, 300.0, 210.0, 300.0, 210.0, 410.0, 520.0, 380.0),
+        ("a", "Carting", "Khambhat_MotvdDPP_D (Gujarat)", "Anand_VUNagar_DC (Gujarat)", 64.0, 18.0, 14.0, 18.0, 14.0, 19.0, 21.0, 16.0),
+        ("b", "FTL", "Bhiwandi_Mankoli_HB (Maharashtra)", "Pune_Tathawde_H (Maharashtra)", 240.0, 130.0, 95.0, 70.0, 55.0, 120.0, 140.0, 90.0),
+        ("c", "FTL", np.nan, np.nan, 150.0, 40.0, 35.0, 40.0, 35.0, 44.0, 50.0, 48.0),
+        ("c", "FTL", np.nan, "Pune_Tathawde_H (Maharashtra)", 150.0, np.nan, 60.0, 25.0, 25.0, 70.0, 81.0, 30.0),
+    ]
+    frame = pd.DataFrame(rows, columns=[
+        "trip_uuid", "route_type", "source_name", "destination_name", "start_scan_to_end_scan",
+        "actual_time", "osrm_time", "segment_actual_time", "segment_osrm_time",
+        "actual_distance_to_destination", "osrm_distance", "segment_osrm_distance",
+    ])
+    od_start = pd.Timestamp("2018-09-20 02:35:36")
+    frame["od_start_time"] = od_start
+    frame["od_end_time"] = od_start + pd.to_timedelta(frame["start_scan_to_end_scan"] + 3, unit="min")
+    return add_features(frame)
+
+
+def _reference(data):
+    # The groupby/merge chain aggregate_trips replaced
+    def window_sum(col):
+        windows = data.groupby(["trip_uuid", "start_scan_to_end_scan"])[col].max().reset_index()
+        return windows.groupby("trip_uuid")[col].sum().reset_index()
+
+    def distinct_sum(col):
+        values = data.groupby("trip_uuid")[col].unique().reset_index()
+        values[col] = values[col].apply(sum)
+        return values
+
+    def segment_sum(col):
+        return data.groupby("trip_uuid")[col].sum().reset_index()
+
+    distances = segment_sum("segment_osrm_distance").merge(
+        window_sum("actual_distance_to_destination").merge(window_sum("osrm_distance"), on="trip_uuid"), on="trip_uuid"
+    )
+    time = segment_sum("segment_osrm_time").merge(window_sum("osrm_time").merge(segment_sum("segment_actual_time").merge(
+        window_sum("actual_time").merge(
+            distinct_sum("time_taken_btwn_odstart_and_od_end").merge(distinct_sum("start_scan_to_end_scan"), on="trip_uuid"),
+            on="trip_uuid"), on="trip_uuid"), on="trip_uuid"), on="trip_uuid")
+    trip_records = time.merge(distances, on="trip_uuid")
+    route_type = data.groupby("trip_uuid")["route_type"].unique().reset_index()
+    trip_records = trip_records.merge(route_type, on="trip_uuid")
+    trip_records["route_type"] = trip_records["route_type"].apply(lambda x: x[0])
+    return trip_records
+
+
+def test_aggregate_trips_matches_groupby_chain():
+    data = _segments()
+    expected = _reference(data)
+    assert data["source_state"].isna().any()
+
+    pd.testing.assert_frame_equal(aggregate_trips(data), expected)
+    pd.testing.assert_frame_equal(aggregate_trips_parallel(data, workers=2), expected)
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from delhivery.stats import StatisticsCache
+
+
+def test_box_summary_copies_are_isolated():
+    frame = pd.DataFrame({"x": np.r_[np.arange(100.0), 1000.0, 2000.0]})
+    cache = StatisticsCache()
+
+    first = cache.box("v1", "t", frame, "x")
+    expected = first["outliers"].copy()
+    first["outliers"][:] = -1
+    first["q1"] = -1
+
+    again = cache.box("v1", "t", frame, "x")
+    assert cache.cache_info().hits == 1
+    np.testing.assert_array_equal(again["outliers"], expected)
+    assert again["q1"] != -1
+
+
+def test_describe_copies_are_isolated():
+    frame = pd.DataFrame({"x": [1.0, 2.0, 3.0]})
+    cache = StatisticsCache()
+
+    summary = cache.describe("v1", "t", frame)
+    summary.loc["mean", "x"] = 99.0
+    assert cache.describe("v1", "t", frame).loc["mean", "x"] == 2.0